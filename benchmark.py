@@ -0,0 +1,253 @@
+import os
+
+# Headless: no window and no audio device needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import contextlib
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import pygame
+from game.game_engine import GameEngine
+from game.ball import Ball
+from game.paddle import Paddle
+
+# Benchmark suite
+#
+# Each benchmark returns one number. Results are written as JSON and can be
+# compared against a stored baseline; the run exits with status 1 when any
+# metric is worse than the baseline by more than the threshold.
+
+WIDTH, HEIGHT = 800, 600
+BENCHMARKS = {}  # name -> (function, unit, higher_is_better)
+
+
+def benchmark(name, unit, higher_is_better):
+    def register(function):
+        BENCHMARKS[name] = (function, unit, higher_is_better)
+        return function
+    return register
+
+
+def best_time(function, repeats):
+    """Fastest of several runs, which is the least noisy estimate"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def playing_engine(**kwargs):
+    engine = GameEngine(WIDTH, HEIGHT, headless=True, seed=0, **kwargs)
+    engine.start_game()
+    return engine
+
+
+@benchmark("engine_update_ticks_per_sec", "ticks/s", True)
+def bench_engine_update(scale):
+    engine = playing_engine()
+    ticks = 20000 * scale
+
+    def run():
+        for _ in range(ticks):
+            engine.step()
+            if engine.game_state != "playing":
+                engine.start_game()
+    return ticks / best_time(run, 3)
+
+
+@benchmark("ball_collision_calls_per_sec", "calls/s", True)
+def bench_ball_collision(scale):
+    player = Paddle(10, 250, 10, 100)
+    ai = Paddle(WIDTH - 20, 250, 10, 100)
+    ball = Ball(WIDTH // 2, HEIGHT // 2, 7, 7, WIDTH, HEIGHT)
+    # Mix of free flight and contacts with either paddle
+    positions = [(400, 300, -5), (18, 300, -5), (775, 300, 5), (200, 100, 5)]
+    calls = 50000 * scale
+
+    def run():
+        for i in range(calls):
+            ball.x, ball.y, ball.velocity_x = positions[i & 3]
+            ball.velocity_y = 3
+            ball.check_collision(player, ai)
+    return calls / best_time(run, 3)
+
+
+def bench_render(state, scale):
+    screen = pygame.display.get_surface()
+    engine = GameEngine(WIDTH, HEIGHT)
+    engine.start_game()
+    engine.winner = engine.series_winner = "Player"
+    engine.game_state = state
+    frames = 300 * scale
+
+    def run():
+        for _ in range(frames):
+            screen.fill((0, 0, 0))
+            engine.render(screen)
+    return best_time(run, 3) / frames * 1000
+
+
+for _state in ("menu", "playing", "game_over", "series_over"):
+    benchmark(f"render_{_state}_ms", "ms/frame", False)(
+        lambda scale, state=_state: bench_render(state, scale))
+
+
+@benchmark("observations_rgb_per_sec", "obs/s", True)
+def bench_observations_rgb(scale):
+    from game.observation import measure
+    return measure(500 * scale)
+
+
+@benchmark("observations_gray_small_per_sec", "obs/s", True)
+def bench_observations_gray_small(scale):
+    from game.observation import measure
+    return measure(500 * scale, grayscale=True, downsample=4, stack=4)
+
+
+@benchmark("env_steps_per_sec", "steps/s", True)
+def bench_env_steps(scale):
+    from game.env import VectorEnv, measure
+    return measure(VectorEnv(16, seed=0), 500 * scale)
+
+
+def bench_multiball(count, scale):
+    from game.multiball import measure
+    result = measure(count, 100 * scale)
+    return result["step_ms"] + result["draw_ms"]
+
+
+for _count in (100, 1000, 4000):
+    benchmark(f"multiball_{_count}_ms", "ms/tick", False)(
+        lambda scale, count=_count: bench_multiball(count, scale))
+
+
+@benchmark("sound_events_per_sec", "events/s", True)
+def bench_sound_events(scale):
+    # A burst of paddle and wall hits per frame, through play_sound and drain
+    engine = playing_engine()
+    engine.init_audio()
+    if not engine.audio:
+        return 0.0
+    engine.sound_bank.preload().join()
+    frames = 500 * scale
+
+    def run():
+        for _ in range(frames):
+            for sound_type in ("paddle", "wall", "paddle", "wall"):
+                engine.play_sound(sound_type)
+            engine.audio.drain()
+    return frames * 4 / best_time(run, 3)
+
+
+@benchmark("engine_init_ms", "ms", False)
+def bench_engine_init(scale):
+    # Cold sound cache, so sound generation is part of the measurement
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["PINGPONG_CACHE_DIR"] = tmp
+            try:
+                engine = GameEngine(WIDTH, HEIGHT)
+                if engine.sounds_enabled:
+                    engine.sound_bank.preload().join()
+            finally:
+                del os.environ["PINGPONG_CACHE_DIR"]
+    return best_time(run, 3) * 1000
+
+
+@benchmark("engine_memory_kb", "KiB/engine", False)
+def bench_engine_memory(scale):
+    count = 50
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    engines = [GameEngine(WIDTH, HEIGHT, headless=True) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del engines
+    return (after - before) / count / 1024
+
+
+def run_benchmarks(names, scale):
+    results = {}
+    for name in names:
+        function, unit, higher_is_better = BENCHMARKS[name]
+        value = function(scale)
+        results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+        print(f"{name:36s} {value:14.3f} {unit}", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Names of metrics that are worse than the baseline by more than threshold"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("metrics", {}).get(name)
+        if reference is None or reference["value"] == 0:
+            continue
+        change = (result["value"] - reference["value"]) / reference["value"]
+        if result["higher_is_better"]:
+            change = -change
+        result["baseline"] = reference["value"]
+        result["change"] = change
+        if change > threshold:
+            regressions.append(name)
+            print(f"REGRESSION {name}: {reference['value']:.3f} -> {result['value']:.3f} "
+                  f"({change:+.1%} worse)", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the game package")
+    parser.add_argument("--output", metavar="PATH", help="write JSON results to PATH instead of stdout")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a stored results file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="also store these results as a baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed relative slowdown before a metric counts as regressed (default 0.15)")
+    parser.add_argument("--scale", type=int, default=1, help="multiply the work per benchmark")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    args = parser.parse_args()
+
+    # Keep the engine's status prints out of the JSON on stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        pygame.init()
+        pygame.display.set_mode((WIDTH, HEIGHT))
+        results = run_benchmarks(args.only or list(BENCHMARKS), args.scale)
+        pygame.quit()
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    report = {
+        "metrics": results,
+        "regressions": regressions,
+        "environment": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "scale": args.scale,
+        },
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text + "\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
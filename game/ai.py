@@ -0,0 +1,157 @@
+import math
+import random
+import struct
+
+# Paddle controllers
+#
+# A controller moves a paddle once per tick: controller.update(paddle, ball,
+# screen_height). controller.reset() is called whenever the ball is served
+# again from the centre. TrackingAI is the original Paddle.auto_track behaviour.
+# PredictiveAI works out where the ball will cross the paddle's x, unfolding
+# wall reflections analytically, and only redoes that when the ball's path
+# changes (a paddle hit or a serve).
+
+# Difficulty tiers: reaction delay (ticks), aim error (pixels), max speed (pixels per tick)
+DIFFICULTIES = {
+    "easy": {"reaction_delay": 20, "error": 80, "max_speed": 4},
+    "medium": {"reaction_delay": 10, "error": 60, "max_speed": 6},
+    "hard": {"reaction_delay": 4, "error": 30, "max_speed": 8},
+    "perfect": {"reaction_delay": 0, "error": 0, "max_speed": 12},
+}
+
+
+class TrackingAI:
+    """Follow the ball's current y, like Paddle.auto_track"""
+    name = "tracking"
+
+    def update(self, paddle, ball, screen_height):
+        paddle.auto_track(ball, screen_height)
+
+    def reset(self):
+        pass
+
+    def get_state(self):
+        return b""
+
+    def set_state(self, state):
+        pass
+
+
+class InputController:
+    """Move by an externally set direction (-1 up, 0 idle, 1 down), e.g. a remote player"""
+    name = "input"
+
+    def __init__(self, speed=10):
+        self.speed = speed
+        self.direction = 0
+
+    def update(self, paddle, ball, screen_height):
+        if self.direction:
+            paddle.move(self.direction * self.speed, screen_height)
+
+    def reset(self):
+        pass
+
+    def get_state(self):
+        return b""  # direction is set before every tick
+
+    def set_state(self, state):
+        pass
+
+
+def make_controller(name, rng=None):
+    """Controller by name: "tracking", "input" or one of the DIFFICULTIES tiers"""
+    if name == "tracking":
+        return TrackingAI()
+    if name == "input":
+        return InputController()
+    return PredictiveAI(name, rng)
+
+
+def predict_intercept(ball, target_x, screen_height):
+    """The ball's y when it reaches target_x, or None if it is moving away
+
+    Wall bounces are handled by unfolding: the ball travels in a straight line
+    through mirrored copies of the field, and the result is folded back.
+    """
+    vx = ball.velocity_x
+    if vx == 0 or (target_x - ball.x) * vx < 0:
+        return None
+    t = (target_x - ball.x) / vx
+    span = screen_height - ball.height  # Range of the ball's top edge
+    if span <= 0:
+        return 0
+    y = (ball.y + ball.velocity_y * t) % (2 * span)
+    return y if y <= span else 2 * span - y
+
+
+# last_velocity (x, |y|), target_y, stale, delay_left; NaN stands for None
+PREDICTIVE_STATE = struct.Struct("<ddd?i")
+
+
+class PredictiveAI:
+    def __init__(self, difficulty="medium", rng=None, **overrides):
+        settings = dict(DIFFICULTIES[difficulty], **overrides)
+        self.difficulty = difficulty
+        self.name = difficulty
+        self.reaction_delay = settings["reaction_delay"]
+        self.error = settings["error"]
+        self.max_speed = settings["max_speed"]
+        self.rng = rng if rng is not None else random
+
+        self.last_velocity = None  # Ball path the cached target was computed for
+        self.target_y = None  # Cached paddle-centre target
+        self.stale = True
+        self.delay_left = 0
+
+    def reset(self):
+        """Forget the cached target; the ball was served again"""
+        self.last_velocity = None
+        self.target_y = None
+        self.stale = True
+
+    def get_state(self):
+        """Mutable state packed into bytes, for engine snapshots"""
+        last_x, last_y = self.last_velocity if self.last_velocity is not None else (math.nan, math.nan)
+        target_y = self.target_y if self.target_y is not None else math.nan
+        return PREDICTIVE_STATE.pack(last_x, last_y, target_y, self.stale, self.delay_left)
+
+    def set_state(self, state):
+        last_x, last_y, target_y, self.stale, self.delay_left = PREDICTIVE_STATE.unpack(state)
+        self.last_velocity = None if math.isnan(last_x) else (last_x, last_y)
+        self.target_y = None if math.isnan(target_y) else target_y
+
+    def update(self, paddle, ball, screen_height):
+        # A wall bounce only flips velocity_y and the unfolded path already
+        # accounts for it, so only paddle hits and serves invalidate the target
+        path = (ball.velocity_x, abs(ball.velocity_y))
+        if path != self.last_velocity:
+            # Keep chasing the old target until the reaction delay runs out
+            self.last_velocity = path
+            self.delay_left = self.reaction_delay
+            self.stale = True
+        if self.delay_left > 0:
+            self.delay_left -= 1
+        elif self.stale:
+            self.target_y = self.compute_target(paddle, ball, screen_height)
+            self.stale = False
+        if self.target_y is None:
+            return
+
+        centre = paddle.y + paddle.height / 2
+        dy = max(-self.max_speed, min(self.max_speed, self.target_y - centre))
+        if dy:
+            paddle.move(dy, screen_height)
+
+    def compute_target(self, paddle, ball, screen_height):
+        """Paddle-centre y to aim for until the ball's velocity changes"""
+        # Aim at the face the ball will touch
+        if ball.velocity_x > 0:
+            face_x = paddle.x - ball.width
+        else:
+            face_x = paddle.x + paddle.width
+        intercept = predict_intercept(ball, face_x, screen_height)
+        if intercept is None:
+            # Ball heading away: drift back to the middle
+            return screen_height / 2
+        return intercept + ball.height / 2 + self.rng.uniform(-self.error, self.error)
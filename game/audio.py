@@ -0,0 +1,83 @@
+import bisect
+import pygame
+
+# Audio dispatch
+#
+# Physics calls GameEngine.play_sound in the middle of a tick, where it only
+# appends to a queue. drain(), once per frame, plays what was queued. Each
+# effect has its own reserved mixer channels: at most one new voice per
+# effect starts per frame, and when all of an effect's channels are busy the
+# voice that started first is cut off for the new one. Effects with pitch
+# variants play the one matching the ball's speed. Sounds are only played
+# once the SoundBank has prepared them, so nothing is synthesized, loaded or
+# logged here.
+
+VOICES = {"paddle": 3, "wall": 3, "score": 1, "click": 1}  # Reserved channels per effect
+SPEED_STEPS = (6.5, 7.5, 8.5)  # Ball speeds (pixels per tick) where each higher pitch starts
+MAX_QUEUED = 64  # Events beyond this in one frame are dropped
+
+
+class AudioDispatcher:
+    def __init__(self, sound_bank, voices=VOICES):
+        self.bank = sound_bank
+        self.queue = []  # (effect name, ball speed)
+        reserved = sum(voices.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved))
+        pygame.mixer.set_reserved(reserved)
+        self.channels = {}  # name -> its reserved Channels
+        self.started = {}  # name -> frame number each of its channels last started a voice
+        first = 0
+        for name, count in voices.items():
+            self.channels[name] = [pygame.mixer.Channel(first + i) for i in range(count)]
+            self.started[name] = [0] * count
+            first += count
+        self.frame = 0
+        self.played = 0
+        self.stolen = 0  # Voices cut off to make room
+        self.dropped = 0  # Events not played: queue full, or sound not prepared yet
+
+    def push(self, name, speed=0.0):
+        """Queue an effect; called from the simulation, so it only appends"""
+        if len(self.queue) < MAX_QUEUED:
+            self.queue.append((name, speed))
+        else:
+            self.dropped += 1
+
+    def drain(self):
+        """Play the effects queued since the last call; call once per frame"""
+        self.frame += 1
+        if not self.queue:
+            return
+        # One voice per effect per frame, pitched for the fastest ball
+        fastest = {}
+        for name, speed in self.queue:
+            if speed >= fastest.get(name, -1.0):
+                fastest[name] = speed
+        self.dropped += len(self.queue) - len(fastest)
+        self.queue.clear()
+
+        for name, speed in fastest.items():
+            if name not in self.bank.effects:
+                self.dropped += 1
+                continue
+            variant = min(bisect.bisect_right(SPEED_STEPS, speed), self.bank.variants(name) - 1)
+            sound = self.bank.ready(name, variant)
+            if sound is None:
+                self.dropped += 1
+                continue
+            channels = self.channels.get(name)
+            if not channels:
+                sound.play()  # Unreserved effect: any free mixer channel
+                self.played += 1
+                continue
+            started = self.started[name]
+            voice = next((i for i, channel in enumerate(channels) if not channel.get_busy()), None)
+            if voice is None:
+                voice = started.index(min(started))
+                self.stolen += 1
+            channels[voice].play(sound)
+            started[voice] = self.frame
+            self.played += 1
+
+    def stats(self):
+        return {"played": self.played, "stolen": self.stolen, "dropped": self.dropped}
@@ -2,7 +2,10 @@ import pygame
 import random
 
 class Ball:
-    def __init__(self, x, y, width, height, screen_width, screen_height, game_engine=None):
+    __slots__ = ("original_x", "original_y", "x", "y", "width", "height", "screen_width",
+                 "screen_height", "rng", "velocity_x", "velocity_y", "game_engine")
+
+    def __init__(self, x, y, width, height, screen_width, screen_height, game_engine=None, rng=None):
         self.original_x = x
         self.original_y = y
         self.x = x
@@ -11,8 +14,9 @@ class Ball:
         self.height = height
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.velocity_x = random.choice([-5, 5])
-        self.velocity_y = random.choice([-3, 3])
+        self.rng = rng if rng is not None else random  # Seeded per engine for replays
+        self.velocity_x = self.rng.choice([-5, 5])
+        self.velocity_y = self.rng.choice([-3, 3])
         self.game_engine = game_engine
 
     def move(self):
@@ -31,13 +35,22 @@ class Ball:
             if self.game_engine:
                 self.game_engine.play_sound("wall")
 
+    def overlaps(self, paddle):
+        """pygame.Rect.colliderect of the two rects, without allocating them"""
+        # Rect truncates float coordinates, so do the same
+        x = int(self.x)
+        y = int(self.y)
+        paddle_x = int(paddle.x)
+        paddle_y = int(paddle.y)
+        return (x < paddle_x + paddle.width and x + self.width > paddle_x and
+                y < paddle_y + paddle.height and y + self.height > paddle_y)
+
     def check_collision(self, player, ai):
-        ball_rect = self.rect()
-        
+        """Bounce off either paddle; returns True if the ball hit one"""
         # Check collision with player paddle (left side)
         if (self.velocity_x < 0 and 
-            ball_rect.colliderect(player.rect()) and 
-            self.x > player.x + player.width // 2):
+            self.x > player.x + player.width // 2 and
+            self.overlaps(player)):
             self.velocity_x = abs(self.velocity_x)  # Ensure ball moves right
             # Position correction to prevent tunneling
             self.x = player.x + player.width
@@ -46,11 +59,12 @@ class Ball:
             self.velocity_y += (hit_pos - 0.5) * 3
             if self.game_engine:
                 self.game_engine.play_sound("paddle")
+            hit = True
             
         # Check collision with AI paddle (right side)  
         elif (self.velocity_x > 0 and 
-              ball_rect.colliderect(ai.rect()) and 
-              self.x < ai.x + ai.width // 2):
+              self.x < ai.x + ai.width // 2 and
+              self.overlaps(ai)):
             self.velocity_x = -abs(self.velocity_x)  # Ensure ball moves left
             # Position correction to prevent tunneling
             self.x = ai.x - self.width
@@ -59,15 +73,19 @@ class Ball:
             self.velocity_y += (hit_pos - 0.5) * 3
             if self.game_engine:
                 self.game_engine.play_sound("paddle")
+            hit = True
+        else:
+            hit = False
             
         # Clamp velocity_y to reasonable bounds to prevent crazy bounces
         self.velocity_y = max(-8, min(8, self.velocity_y))
+        return hit
 
     def reset(self):
         self.x = self.original_x
         self.y = self.original_y
         self.velocity_x *= -1
-        self.velocity_y = random.choice([-3, 3])
+        self.velocity_y = self.rng.choice([-3, 3])
 
     def rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
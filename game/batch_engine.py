@@ -0,0 +1,284 @@
+import numpy as np
+
+# Batched headless engine
+#
+# Keeps the state of many matches in NumPy arrays and steps all of them with
+# one vectorized call. The rules mirror GameEngine.update, Ball.move,
+# Ball.check_collision and Paddle.auto_track (TrackingAI) exactly, including pygame.Rect's
+# truncation of float coordinates, so results can be cross-checked against
+# the scalar engine (see cross_check below).
+
+PLAYER_STEP = 10  # PLAYER_SPEED, pixels per tick for W/S movement
+AI_SPEED = 7  # Paddle.speed
+MAX_VELOCITY_Y = 8
+
+
+class BatchEngine:
+    def __init__(self, num_matches, width=800, height=600, series_length=5,
+                 winning_score=5, seed=None):
+        self.num_matches = num_matches
+        self.width = width
+        self.height = height
+        self.series_length = series_length
+        self.winning_score = winning_score
+        self.rng = np.random.default_rng(seed)
+
+        # Same geometry as GameEngine
+        self.paddle_width = 10
+        self.paddle_height = 100
+        self.ball_size = 7
+        self.player_x = 10
+        self.ai_x = width - 20
+        self.ball_origin_x = width // 2
+        self.ball_origin_y = height // 2
+
+        n = num_matches
+        self.ball_x = np.zeros(n)
+        self.ball_y = np.zeros(n)
+        self.ball_vx = np.zeros(n)
+        self.ball_vy = np.zeros(n)
+        self.player_y = np.zeros(n)
+        self.ai_y = np.zeros(n)
+        self.player_score = np.zeros(n, dtype=np.int32)
+        self.ai_score = np.zeros(n, dtype=np.int32)
+        self.player_series_wins = np.zeros(n, dtype=np.int32)
+        self.ai_series_wins = np.zeros(n, dtype=np.int32)
+        self.games_played = np.zeros(n, dtype=np.int32)
+        self.series_over = np.zeros(n, dtype=bool)
+
+        # Per-step results: +1 player scored, -1 AI scored, 0 no point
+        self.last_point = np.zeros(n, dtype=np.int8)
+        self.paddle_hits = np.zeros(n, dtype=bool)
+        self.wall_hits = np.zeros(n, dtype=bool)
+        self.ball_resets = np.zeros(n, dtype=bool)
+
+        self.ball_x[:] = self.ball_origin_x
+        self.ball_y[:] = self.ball_origin_y
+        self.ball_vx[:] = self.rng.choice([-5, 5], size=n)
+        self.ball_vy[:] = self.rng.choice([-3, 3], size=n)
+        self.player_y[:] = height // 2 - 50
+        self.ai_y[:] = height // 2 - 50
+        self.start_series()
+
+    @classmethod
+    def from_engines(cls, engines):
+        """Build a batch whose matches copy the state of scalar GameEngines"""
+        first = engines[0]
+        batch = cls(len(engines), first.width, first.height,
+                    first.series_length, first.winning_score)
+        for i, engine in enumerate(engines):
+            batch.ball_x[i] = engine.ball.x
+            batch.ball_y[i] = engine.ball.y
+            batch.ball_vx[i] = engine.ball.velocity_x
+            batch.ball_vy[i] = engine.ball.velocity_y
+            batch.player_y[i] = engine.player.y
+            batch.ai_y[i] = engine.ai.y
+            batch.player_score[i] = engine.player_score
+            batch.ai_score[i] = engine.ai_score
+            batch.player_series_wins[i] = engine.player_series_wins
+            batch.ai_series_wins[i] = engine.ai_series_wins
+            batch.games_played[i] = engine.games_played
+            batch.series_over[i] = engine.series_winner is not None
+        return batch
+
+    def start_series(self, mask=None):
+        """Start a new series, like GameEngine.start_game (all matches by default)"""
+        if mask is None:
+            mask = np.ones(self.num_matches, dtype=bool)
+        self.player_score[mask] = 0
+        self.ai_score[mask] = 0
+        self.player_series_wins[mask] = 0
+        self.ai_series_wins[mask] = 0
+        self.games_played[mask] = 0
+        self.series_over[mask] = False
+        self._reset_balls(mask)
+
+    def _reset_balls(self, mask):
+        """Vectorized Ball.reset for the matches selected by mask"""
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            return
+        self.ball_x[mask] = self.ball_origin_x
+        self.ball_y[mask] = self.ball_origin_y
+        self.ball_vx[mask] *= -1
+        self.ball_vy[mask] = self.rng.choice([-3, 3], size=count)
+        self.ball_resets |= mask
+
+    def step(self, player_actions=None):
+        """Advance every unfinished match by one tick
+
+        player_actions holds -1 (up, W), 0 (idle) or 1 (down, S) per match.
+        Returns last_point: +1 where the player scored, -1 where the AI scored.
+        Games that end start the next game of the series immediately; matches
+        whose series is over are frozen until start_series is called.
+        """
+        active = ~self.series_over
+        self.last_point[:] = 0
+        self.paddle_hits[:] = False
+        self.wall_hits[:] = False
+        self.ball_resets[:] = False
+
+        # Player paddle input (GameEngine.handle_input)
+        if player_actions is not None:
+            dy = np.where(active, np.asarray(player_actions) * PLAYER_STEP, 0)
+            np.clip(self.player_y + dy, 0, self.height - self.paddle_height,
+                    out=self.player_y)
+
+        self._move_balls(active)
+        self._check_collisions(active)
+        self._check_scores(active)
+        self._auto_track(active)
+        return self.last_point
+
+    def _move_balls(self, active):
+        """Vectorized Ball.move"""
+        self.ball_x += np.where(active, self.ball_vx, 0)
+        self.ball_y += np.where(active, self.ball_vy, 0)
+
+        top = active & (self.ball_y <= 0)
+        bottom = active & ~top & (self.ball_y + self.ball_size >= self.height)
+        self.ball_y[top] = 0
+        self.ball_vy[top] = np.abs(self.ball_vy[top])
+        self.ball_y[bottom] = self.height - self.ball_size
+        self.ball_vy[bottom] = -np.abs(self.ball_vy[bottom])
+        self.wall_hits |= top | bottom
+
+    def _overlaps(self, ball_x, ball_y, paddle_x, paddle_y):
+        """pygame.Rect.colliderect on truncated coordinates"""
+        size = self.ball_size
+        return ((ball_x < paddle_x + self.paddle_width) &
+                (ball_x + size > paddle_x) &
+                (ball_y < paddle_y + self.paddle_height) &
+                (ball_y + size > paddle_y))
+
+    def _check_collisions(self, active):
+        """Vectorized Ball.check_collision"""
+        ball_x = np.trunc(self.ball_x)
+        ball_y = np.trunc(self.ball_y)
+        half_width = self.paddle_width // 2
+
+        player_hit = (active & (self.ball_vx < 0) &
+                      self._overlaps(ball_x, ball_y, self.player_x, np.trunc(self.player_y)) &
+                      (self.ball_x > self.player_x + half_width))
+        ai_hit = (active & ~player_hit & (self.ball_vx > 0) &
+                  self._overlaps(ball_x, ball_y, self.ai_x, np.trunc(self.ai_y)) &
+                  (self.ball_x < self.ai_x + half_width))
+
+        self.ball_vx[player_hit] = np.abs(self.ball_vx[player_hit])
+        self.ball_x[player_hit] = self.player_x + self.paddle_width
+        hit_pos = (self.ball_y[player_hit] + self.ball_size // 2 - self.player_y[player_hit]) / self.paddle_height
+        self.ball_vy[player_hit] += (hit_pos - 0.5) * 3
+
+        self.ball_vx[ai_hit] = -np.abs(self.ball_vx[ai_hit])
+        self.ball_x[ai_hit] = self.ai_x - self.ball_size
+        hit_pos = (self.ball_y[ai_hit] + self.ball_size // 2 - self.ai_y[ai_hit]) / self.paddle_height
+        self.ball_vy[ai_hit] += (hit_pos - 0.5) * 3
+
+        self.paddle_hits |= player_hit | ai_hit
+        np.clip(self.ball_vy, -MAX_VELOCITY_Y, MAX_VELOCITY_Y, out=self.ball_vy)
+
+    def _check_scores(self, active):
+        """Scoring, GameEngine.check_win_condition and record_series_score"""
+        ai_point = active & (self.ball_x <= 0)
+        player_point = active & ~ai_point & (self.ball_x >= self.width)
+        self.ai_score += ai_point
+        self.player_score += player_point
+        self.last_point[player_point] = 1
+        self.last_point[ai_point] = -1
+        self._reset_balls(ai_point | player_point)
+
+        player_game = player_point & (self.player_score >= self.winning_score)
+        ai_game = ai_point & (self.ai_score >= self.winning_score)
+        game_over = player_game | ai_game
+        if not game_over.any():
+            return
+        self.games_played += game_over
+        self.player_series_wins += player_game
+        self.ai_series_wins += ai_game
+
+        games_to_win = (self.series_length + 1) // 2
+        self.series_over |= game_over & ((self.player_series_wins >= games_to_win) |
+                                         (self.ai_series_wins >= games_to_win))
+
+        # GameEngine.start_next_game for games whose series continues
+        next_game = game_over & ~self.series_over
+        self.player_score[next_game] = 0
+        self.ai_score[next_game] = 0
+        self._reset_balls(next_game)
+
+    def _auto_track(self, active):
+        """Vectorized Paddle.auto_track for the AI paddle"""
+        up = active & (self.ball_y < self.ai_y)
+        down = active & ~up & (self.ball_y > self.ai_y + self.paddle_height)
+        self.ai_y += np.where(up, -AI_SPEED, 0) + np.where(down, AI_SPEED, 0)
+        np.clip(self.ai_y, 0, self.height - self.paddle_height, out=self.ai_y)
+
+    @property
+    def series_winner(self):
+        """+1 where the player won the series, -1 where the AI did, 0 otherwise"""
+        games_to_win = (self.series_length + 1) // 2
+        winner = np.zeros(self.num_matches, dtype=np.int8)
+        winner[self.series_over & (self.player_series_wins >= games_to_win)] = 1
+        winner[self.series_over & (self.ai_series_wins >= games_to_win)] = -1
+        return winner
+
+
+def cross_check(num_matches=64, ticks=20000, seed=0):
+    """Step scalar GameEngines and a BatchEngine side by side and compare them
+
+    The same random player inputs drive both. Ball.reset draws its vertical
+    velocity from each engine's own RNG, so after each reset the batch adopts
+    the scalar draw; every other value must match exactly. Returns the number of
+    ticks checked and raises AssertionError on the first mismatch.
+    """
+    from .game_engine import GameEngine
+    from .ai import TrackingAI
+
+    engines = [GameEngine(800, 600, headless=True, ai_controller=TrackingAI(), seed=seed + i)
+               for i in range(num_matches)]
+    for engine in engines:
+        engine.start_game()
+    batch = BatchEngine.from_engines(engines)
+    actions_rng = np.random.default_rng(seed)
+
+    for tick in range(ticks):
+        actions = actions_rng.integers(-1, 2, size=num_matches)
+        for engine, action in zip(engines, actions):
+            if engine.game_state != "playing":
+                continue
+            engine.player_direction = int(action)
+            engine.step()
+            if engine.game_state == "game_over" and engine.series_winner is None:
+                engine.start_next_game()
+        batch.step(actions)
+
+        for i, engine in enumerate(engines):
+            if batch.ball_resets[i]:
+                batch.ball_vy[i] = engine.ball.velocity_y
+            expected = (engine.ball.x, engine.ball.y, engine.ball.velocity_x,
+                        engine.ball.velocity_y, engine.player.y, engine.ai.y,
+                        engine.player_score, engine.ai_score,
+                        engine.player_series_wins, engine.ai_series_wins,
+                        engine.series_winner is not None)
+            actual = (batch.ball_x[i], batch.ball_y[i], batch.ball_vx[i],
+                      batch.ball_vy[i], batch.player_y[i], batch.ai_y[i],
+                      batch.player_score[i], batch.ai_score[i],
+                      batch.player_series_wins[i], batch.ai_series_wins[i],
+                      batch.series_over[i])
+            assert expected == actual, f"tick {tick}, match {i}: {expected} != {actual}"
+    return ticks
+
+
+if __name__ == "__main__":
+    import time
+
+    checked = cross_check()
+    print(f"Batch engine matches scalar engine over {checked} ticks")
+
+    batch = BatchEngine(10000, seed=0)
+    steps = 1000
+    start = time.perf_counter()
+    for _ in range(steps):
+        batch.step()
+    elapsed = time.perf_counter() - start
+    print(f"{batch.num_matches * steps / elapsed:,.0f} match-ticks/sec")
@@ -0,0 +1,7 @@
+import os
+
+
+def cache_dir():
+    """Directory for caches that speed up startup ($PINGPONG_CACHE_DIR, default ~/.cache/pingpong)"""
+    return os.environ.get("PINGPONG_CACHE_DIR",
+                          os.path.join(os.path.expanduser("~"), ".cache", "pingpong"))
@@ -0,0 +1,361 @@
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import multiprocessing
+import struct
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from .ai import InputController, make_controller
+from .game_engine import GameEngine
+
+try:
+    import gymnasium
+except ImportError:
+    gymnasium = None
+
+# Reinforcement learning environments
+#
+# PongEnv follows the Gymnasium API: reset() returns (observation, info) and
+# step(action) returns (observation, reward, terminated, truncated, info).
+# An episode is one game, up to the engine's winning score. The observation
+# is the ball's position and velocity and both paddles' positions and
+# velocities, in pixels and pixels per tick; the reward is +1 when the
+# controlled side scores and -1 when the other side does.
+#
+# VectorEnv steps N environments in this process. SubprocessVectorEnv splits
+# them across worker processes that read actions from and write results to
+# one shared-memory block, so a step only sends a one-byte command to each
+# worker and nothing is pickled. Both reset an environment as soon as its
+# episode ends, keeping the last observation of the finished episode in
+# info["final_observation"].
+
+OBSERVATION_FIELDS = ("ball_x", "ball_y", "ball_vx", "ball_vy",
+                      "left_y", "left_vy", "right_y", "right_vy")
+OBSERVATION_SIZE = len(OBSERVATION_FIELDS)
+ACTION_DIRECTIONS = (-1, 0, 1)  # Action 0 moves the paddle up, 1 holds it, 2 moves it down
+SIDES = ("left", "right", "both")
+
+
+class PongEnv:
+    metadata = {"render_modes": []}
+
+    def __init__(self, side="left", opponent="medium", frame_skip=1, max_steps=None, seed=None,
+                 swept_collision=False, width=800, height=600, observation=None):
+        if side not in SIDES:
+            raise ValueError(f"side must be one of {', '.join(SIDES)}, not {side!r}")
+        self.side = side  # Paddle(s) the actions move; "both" takes a (left, right) pair
+        self.frame_skip = frame_skip  # Ticks per step, with the same action
+        self.max_steps = max_steps  # Steps before an episode is truncated (None: never)
+        self.engine = GameEngine(width, height, headless=True, swept_collision=swept_collision,
+                                 seed=seed)
+        engine = self.engine
+        self.left = InputController() if side in ("left", "both") else make_controller(opponent, engine.rng)
+        self.right = InputController() if side in ("right", "both") else make_controller(opponent, engine.rng)
+        engine.player_controller = self.left
+        engine.ai_controller = self.right
+        # Vector environments pass a row of their shared observation array
+        self.observation = observation if observation is not None else np.zeros(OBSERVATION_SIZE, np.float32)
+        self.steps = 0
+
+        if gymnasium is not None:
+            spaces = gymnasium.spaces
+            high = np.array([width, height, np.inf, np.inf, height, np.inf, height, np.inf], np.float32)
+            low = np.where(np.isinf(high), -np.inf, 0).astype(np.float32)
+            self.observation_space = spaces.Box(low, high, dtype=np.float32)
+            self.action_space = spaces.MultiDiscrete([3, 3]) if side == "both" else spaces.Discrete(3)
+        else:
+            self.observation_space = self.action_space = None
+
+    def reset(self, seed=None, options=None):
+        self._reset(seed)
+        return self.observation.copy(), self._info()
+
+    def step(self, action):
+        reward, terminated, truncated = self._step(action)
+        return self.observation.copy(), reward, terminated, truncated, self._info()
+
+    def close(self):
+        pass
+
+    def _reset(self, seed=None):
+        engine = self.engine
+        if seed is not None:
+            engine.rng.seed(seed)
+        engine.player.y = engine.ai.y = engine.height // 2 - engine.paddle_height // 2
+        engine.start_game()
+        self.steps = 0
+        self._observe()
+
+    def _step(self, action):
+        """Advance one step, writing the observation in place; returns (reward, terminated, truncated)"""
+        engine = self.engine
+        if self.side == "both":
+            self.left.direction = ACTION_DIRECTIONS[action[0]]
+            self.right.direction = ACTION_DIRECTIONS[action[1]]
+        elif self.side == "left":
+            self.left.direction = ACTION_DIRECTIONS[action]
+        else:
+            self.right.direction = ACTION_DIRECTIONS[action]
+
+        left_score, right_score = engine.player_score, engine.ai_score
+        for _ in range(self.frame_skip):
+            engine.step()
+            if engine.game_state != "playing":
+                break  # check_win_condition ended the game
+        self.steps += 1
+        self._observe()
+
+        reward = (engine.player_score - left_score) - (engine.ai_score - right_score)
+        if self.side == "right":
+            reward = -reward
+        terminated = engine.game_state != "playing"
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return float(reward), terminated, truncated
+
+    def _observe(self):
+        engine = self.engine
+        ball = engine.ball
+        _, _, previous_left_y, previous_right_y = engine.previous_positions
+        self.observation[:] = (ball.x, ball.y, ball.velocity_x, ball.velocity_y,
+                               engine.player.y, engine.player.y - previous_left_y,
+                               engine.ai.y, engine.ai.y - previous_right_y)
+
+    def _info(self):
+        engine = self.engine
+        return {"left_score": engine.player_score, "right_score": engine.ai_score,
+                "rally_hits": engine.rally_hits, "steps": self.steps}
+
+
+def action_size(side):
+    return 2 if side == "both" else 1
+
+
+def buffer_layout(num_envs, side):
+    """(name, dtype, shape) of each array a vector environment exchanges per step"""
+    return (
+        ("actions", np.int8, (num_envs, action_size(side))),
+        ("observations", np.float32, (num_envs, OBSERVATION_SIZE)),
+        ("final_observations", np.float32, (num_envs, OBSERVATION_SIZE)),
+        ("rewards", np.float32, (num_envs,)),
+        ("terminated", np.bool_, (num_envs,)),
+        ("truncated", np.bool_, (num_envs,)),
+    )
+
+
+def buffer_size(layout):
+    return sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in layout)
+
+
+def buffer_arrays(layout, buffer=None):
+    """Arrays for layout laid out back to back in buffer (new zeroed memory if None)"""
+    if buffer is None:
+        buffer = bytearray(buffer_size(layout))
+    arrays = {}
+    offset = 0
+    for name, dtype, shape in layout:
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += arrays[name].nbytes
+    return arrays
+
+
+class EnvGroup:
+    """Consecutive environments of a vector environment, stepped in one process"""
+
+    def __init__(self, arrays, start, stop, side, seed, env_options):
+        self.arrays = arrays
+        self.start = start
+        self.stop = stop
+        self.side = side
+        self.envs = [PongEnv(side=side, seed=None if seed is None else seed + index,
+                             observation=arrays["observations"][index], **env_options)
+                     for index in range(start, stop)]
+
+    def reset(self, seed=None):
+        for index, env in enumerate(self.envs, self.start):
+            env._reset(None if seed is None else seed + index)
+        self.arrays["terminated"][self.start:self.stop] = False
+        self.arrays["truncated"][self.start:self.stop] = False
+
+    def step(self):
+        arrays = self.arrays
+        actions = arrays["actions"]
+        rewards = arrays["rewards"]
+        terminated = arrays["terminated"]
+        truncated = arrays["truncated"]
+        both = self.side == "both"
+        for index, env in enumerate(self.envs, self.start):
+            action = actions[index] if both else actions[index, 0]
+            rewards[index], terminated[index], truncated[index] = env._step(action)
+            if terminated[index] or truncated[index]:
+                arrays["final_observations"][index] = env.observation
+                env._reset()
+
+
+class VectorEnv:
+    """num_envs environments stepped one after another in this process
+
+    The arrays step() and reset() return are reused by every call; copy them to keep them.
+    """
+
+    def __init__(self, num_envs, side="left", seed=None, **env_options):
+        self.num_envs = num_envs
+        self.side = side
+        self.workers = 1
+        self.arrays = buffer_arrays(buffer_layout(num_envs, side))
+        self.group = EnvGroup(self.arrays, 0, num_envs, side, seed, env_options)
+        self.single_observation_space = self.group.envs[0].observation_space
+        self.single_action_space = self.group.envs[0].action_space
+
+    def reset(self, seed=None, options=None):
+        self.group.reset(seed)
+        return self.arrays["observations"], {}
+
+    def step(self, actions):
+        self.arrays["actions"][:] = np.reshape(actions, self.arrays["actions"].shape)
+        self.group.step()
+        return self._results()
+
+    def _results(self):
+        arrays = self.arrays
+        done = arrays["terminated"] | arrays["truncated"]
+        info = {"final_observation": arrays["final_observations"], "_final_observation": done}
+        return arrays["observations"], arrays["rewards"], arrays["terminated"], arrays["truncated"], info
+
+    def close(self):
+        pass
+
+
+def run_worker(connection, memory, num_envs, side, start, stop, seed, env_options):
+    """Worker loop for SubprocessVectorEnv: one-byte commands in, an empty reply when done"""
+    arrays = buffer_arrays(buffer_layout(num_envs, side), memory.buf)
+    group = EnvGroup(arrays, start, stop, side, seed, env_options)
+    connection.send_bytes(b"")
+    while True:
+        command = connection.recv_bytes()
+        if command == b"s":
+            group.step()
+        elif command[:1] == b"r":
+            group.reset(struct.unpack("<q", command[1:])[0] if len(command) > 1 else None)
+        else:
+            break
+        connection.send_bytes(b"")
+    del arrays, group
+    memory.close()
+    connection.close()
+
+
+class SubprocessVectorEnv(VectorEnv):
+    """num_envs environments split across worker processes sharing one memory block"""
+
+    def __init__(self, num_envs, workers=None, side="left", seed=None, **env_options):
+        self.num_envs = num_envs
+        self.side = side
+        self.workers = min(workers or os.cpu_count(), num_envs)
+        layout = buffer_layout(num_envs, side)
+        self.memory = shared_memory.SharedMemory(create=True, size=buffer_size(layout))
+        self.arrays = buffer_arrays(layout, self.memory.buf)
+        if gymnasium is not None:
+            probe = PongEnv(side=side, **env_options)
+            self.single_observation_space = probe.observation_space
+            self.single_action_space = probe.action_space
+        else:
+            self.single_observation_space = self.single_action_space = None
+
+        self.connections = []
+        self.processes = []
+        bounds = np.linspace(0, num_envs, self.workers + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            connection, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_worker, daemon=True,
+                args=(child, self.memory, num_envs, side, int(start), int(stop), seed, env_options))
+            process.start()
+            child.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+        self._wait()
+
+    def reset(self, seed=None, options=None):
+        self._send(b"r" + (b"" if seed is None else struct.pack("<q", seed)))
+        return self.arrays["observations"], {}
+
+    def step(self, actions):
+        self.arrays["actions"][:] = np.reshape(actions, self.arrays["actions"].shape)
+        self._send(b"s")
+        return self._results()
+
+    def _send(self, command):
+        for connection in self.connections:
+            connection.send_bytes(command)
+        self._wait()
+
+    def _wait(self):
+        for connection in self.connections:
+            connection.recv_bytes()
+
+    def close(self):
+        if not self.processes:
+            return
+        for connection in self.connections:
+            connection.send_bytes(b"q")
+        for process in self.processes:
+            process.join()
+        for connection in self.connections:
+            connection.close()
+        self.processes = []
+        self.arrays = None
+        self.memory.unlink()
+        try:
+            self.memory.close()
+        except BufferError:
+            pass  # The caller still holds arrays from step(); the mapping goes with them
+
+
+def measure(vector_env, steps=2000, seed=0):
+    """Environment steps per second (all environments) under random actions"""
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 3, size=(steps,) + vector_env.arrays["actions"].shape, dtype=np.int8)
+    vector_env.reset(seed)
+    start = time.perf_counter()
+    for step_actions in actions:
+        vector_env.step(step_actions)
+    return steps * vector_env.num_envs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure environment throughput under random actions")
+    parser.add_argument("--envs", type=int, default=64, help="environments per vector environment")
+    parser.add_argument("--steps", type=int, default=500, help="vector steps per measurement")
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="worker counts for the subprocess version (default: 1, 2, 4, ... up to the CPU count)")
+    parser.add_argument("--side", choices=SIDES, default="left")
+    parser.add_argument("--frame-skip", type=int, default=1)
+    args = parser.parse_args()
+
+    workers = args.workers
+    if workers is None:
+        workers = [1]
+        while workers[-1] * 2 <= min(os.cpu_count(), args.envs):
+            workers.append(workers[-1] * 2)
+
+    options = {"side": args.side, "frame_skip": args.frame_skip}
+    print(f"{args.envs} environments, {args.steps} steps, side {args.side}, frame skip {args.frame_skip}")
+    print(f"{'':<24}{'steps/s':>10}{'per core':>10}")
+    env = VectorEnv(args.envs, **options)
+    rate = measure(env, args.steps)
+    env.close()
+    print(f"{'in process':<24}{rate:>10.0f}{rate:>10.0f}")
+    for count in workers:
+        env = SubprocessVectorEnv(args.envs, count, **options)
+        try:
+            rate = measure(env, args.steps)
+        finally:
+            env.close()
+        print(f"{f'{env.workers} worker processes':<24}{rate:>10.0f}{rate / env.workers:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
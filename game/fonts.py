@@ -0,0 +1,49 @@
+import json
+import os
+import pygame
+from .cache import cache_dir
+
+# Font loading without system font scans
+#
+# pygame.font.SysFont enumerates every installed font (fc-list on Linux) each
+# time it is called. The path a font name resolves to is looked up once and
+# remembered in fonts.json in the cache directory; later launches open the
+# file directly. Names with no match fall back to pygame's bundled default
+# font, as SysFont does.
+
+FONT_CACHE_FILE = "fonts.json"
+
+_paths = None  # name -> path (None: bundled default font), loaded on first use
+
+
+def _cache_file():
+    return os.path.join(cache_dir(), FONT_CACHE_FILE)
+
+
+def font_path(name):
+    """Path of the system font called name, or None for pygame's default font"""
+    global _paths
+    if _paths is None:
+        try:
+            with open(_cache_file()) as f:
+                _paths = json.load(f)
+        except (OSError, ValueError):
+            _paths = {}
+
+    key = name.lower()
+    if key in _paths and (_paths[key] is None or os.path.exists(_paths[key])):
+        return _paths[key]
+
+    _paths[key] = pygame.font.match_font(name)  # The slow system scan
+    try:
+        os.makedirs(cache_dir(), exist_ok=True)
+        with open(_cache_file(), "w") as f:
+            json.dump(_paths, f, indent=2)
+    except OSError as e:
+        print(f"Could not write font cache: {e}")
+    return _paths[key]
+
+
+def load_font(name, size):
+    """Equivalent of pygame.font.SysFont(name, size) using the cached lookup"""
+    return pygame.font.Font(font_path(name), size)
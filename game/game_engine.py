@@ -1,30 +1,83 @@
+import math
+import struct
 import pygame
-import numpy as np
 from .paddle import Paddle
 from .ball import Ball
+from .text_cache import TextCache
+from .fonts import load_font
+from .sound_bank import SoundBank
+from .audio import AudioDispatcher
+from .collision import sweep
+from .ai import PredictiveAI
+from .rng import SmallRandom
 
 # Game Engine
 
 WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 
+# Fixed timestep: every speed (ball, paddles) is in pixels per tick
+TICK_RATE = 60
+TICK_TIME = 1.0 / TICK_RATE
+MAX_FRAME_TIME = 0.25  # Drop simulation time beyond this after a stall
+PLAYER_SPEED = 10
+
+# Packed simulation state for snapshot(): ball x/y/vx/vy, paddle ys, game and
+# series counters, selected match, state/winner codes, player input, RNG state,
+# rally counters and the length of the AI controller's state. The AI
+# controller's state bytes follow it, then the player controller's, if any.
+GAME_STATES = ("menu", "playing", "game_over", "series_over")
+WINNERS = (None, "Player", "AI")
+SNAPSHOT = struct.Struct("<6d7hBBBBdQhhB")
+
 class GameEngine:
-    def __init__(self, width, height):
+    def __init__(self, width, height, headless=False, swept_collision=False, ai_controller=None,
+                 seed=None, player_controller=None, defer_audio=False, render_mode=None):
         self.width = width
         self.height = height
         self.paddle_width = 10
         self.paddle_height = 100
+        self.rng = SmallRandom(seed)  # All gameplay randomness, so matches can be replayed
 
         self.player = Paddle(10, height // 2 - 50, self.paddle_width, self.paddle_height)
         self.ai = Paddle(width - 20, height // 2 - 50, self.paddle_width, self.paddle_height)
-        self.ball = Ball(width // 2, height // 2, 7, 7, width, height, self)
+        self.ball = Ball(width // 2, height // 2, 7, 7, width, height, self, self.rng)
+        self.ai_controller = ai_controller if ai_controller is not None else PredictiveAI("medium", self.rng)
+        self.player_controller = player_controller  # None: the left paddle follows W/S
+
+        # Paddle hits in the current rally, and in the last finished one
+        self.rally_hits = 0
+        self.last_rally_hits = 0
 
         self.player_score = 0
         self.ai_score = 0
-        self.font = pygame.font.SysFont("Arial", 30)
-        self.big_font = pygame.font.SysFont("Arial", 60)
-        self.small_font = pygame.font.SysFont("Arial", 20)
+
+        # Fixed-timestep state
+        self.accumulator = 0.0
+        self.render_alpha = 1.0  # Interpolation factor between the last two ticks
+        self.player_direction = 0  # -1 up, 0 idle, 1 down (or a fraction); applied once per tick
+        self.player_input = None  # PaddleInput setting player_direction per tick, see input.py
+        self.swept_collision = swept_collision  # Continuous collision, for fast balls
+        self.recorder = None  # ReplayRecorder, see replay.py
+        self.multiball = None  # Extra balls for the stress mode, see multiball.py
+        self.history = None  # MatchHistory, see history.py
+        self.muted = False  # Silences sounds, e.g. while re-simulating after a rollback
+        self.previous_positions = self.positions()
+        self.headless = headless  # No fonts or sound, for simulation-only use
+        self.render_mode = render_mode  # "rgb_array": silent, drawn offscreen by render_frame()
+        if render_mode == "rgb_array":
+            self.headless = headless = True
+            pygame.font.init()
+            # The surface draws straight into frame_buffer, so array views of it need no copy
+            self.frame_buffer = bytearray(width * height * 4)
+            self.frame = pygame.image.frombuffer(self.frame_buffer, (width, height), "RGBX")
+        if not headless or render_mode == "rgb_array":
+            self.font = load_font("Arial", 30)
+            self.big_font = load_font("Arial", 60)
+            self.small_font = load_font("Arial", 20)
+            self.text_cache = TextCache()
         
         # Game state management
         self.game_state = "menu"  # "menu", "playing", "game_over", "series_over"
@@ -40,13 +93,23 @@ class GameEngine:
         self.games_played = 0
         self.series_winner = None
         
-        # Initialize sound system
+        # Initialize sound system (callers that want a fast first frame do it later)
+        self.sounds_enabled = False
+        self.audio = None  # AudioDispatcher; play_sound queues on it, main loops drain it
+        if not headless and not defer_audio:
+            self.init_audio()
+
+    def init_audio(self):
+        """Set up the mixer and start preparing sound effects"""
         try:
             pygame.mixer.pre_init(frequency=22050, size=-16, channels=2, buffer=512)
             pygame.mixer.init()
             self.sounds_enabled = True
             print("Sound system initialized successfully")
-            self.generate_sounds()
+            # Effects are synthesized (or loaded from the disk cache) in the background
+            self.sound_bank = SoundBank()
+            self.sound_bank.preload()
+            self.audio = AudioDispatcher(self.sound_bank)
         except Exception as e:
             print(f"Sound initialization failed: {e}")
             self.sounds_enabled = False
@@ -70,10 +133,10 @@ class GameEngine:
                         return "quit"
         
         elif self.game_state == "playing":
-            if keys[pygame.K_w]:
-                self.player.move(-10, self.height)
-            if keys[pygame.K_s]:
-                self.player.move(10, self.height)
+            if self.player_input is not None:
+                self.player_input.poll(events)
+            else:
+                self.player_direction = keys[pygame.K_s] - keys[pygame.K_w]
                 
         elif self.game_state == "game_over":
             for event in events:
@@ -108,26 +171,144 @@ class GameEngine:
         self.games_played = 0
         self.series_winner = None
         self.game_state = "playing"
+        if self.recorder:
+            self.recorder.start(self)
+        if self.history:
+            self.history.series_started(self)
         self.ball.reset()
+        self.ai_controller.reset()
+        if self.player_controller:
+            self.player_controller.reset()
+        self.rally_hits = 0
+        self.player_direction = 0
+        if self.player_input is not None:
+            self.player_input.resync()
+        self.previous_positions = self.positions()
+
+
+    def update(self, frame_time=None):
+        """Advance the simulation by frame_time seconds of fixed ticks
 
+        Leftover time is carried to the next frame and used to interpolate
+        rendering. Without frame_time a single tick is run. Returns the
+        number of ticks run.
+        """
+        if frame_time is None:
+            self.step()
+            self.render_alpha = 1.0
+            return 1
 
-    def update(self):
+        self.accumulator += min(frame_time, MAX_FRAME_TIME)
+        ticks = 0
+        while self.accumulator >= TICK_TIME:
+            if self.player_input is not None:
+                # The real time this tick stands for; see input.py
+                end = self.player_input.sampled_at + 2 * TICK_TIME - self.accumulator
+                self.player_direction = self.player_input.tick_direction(end - TICK_TIME, end)
+            self.step()
+            self.accumulator -= TICK_TIME
+            ticks += 1
+        self.render_alpha = self.accumulator / TICK_TIME
+        return ticks
+
+    def step(self):
+        """Run one fixed simulation tick"""
+        self.previous_positions = self.positions()
         if self.game_state == "playing":
-            self.ball.move()
-            self.ball.check_collision(self.player, self.ai)
+            if self.recorder:
+                self.recorder.record_tick(self)
+            if self.player_controller:
+                self.player_controller.update(self.player, self.ball, self.height)
+            elif self.player_direction:
+                self.player.move(self.player_direction * PLAYER_SPEED, self.height)
+            if self.swept_collision:
+                self.rally_hits += sweep(self.ball, self.player, self.ai, self.height)
+            else:
+                self.ball.move()
+                if self.ball.check_collision(self.player, self.ai):
+                    self.rally_hits += 1
 
+            point_scored = self.ball.x <= 0 or self.ball.x >= self.width
+            if point_scored:
+                self.last_rally_hits = self.rally_hits
+                self.rally_hits = 0
             if self.ball.x <= 0:
                 self.ai_score += 1
                 self.play_sound("score")
                 self.ball.reset()
+                if self.history:
+                    self.history.point_scored(self, "AI")
                 self.check_win_condition()
             elif self.ball.x >= self.width:
                 self.player_score += 1
                 self.play_sound("score")
                 self.ball.reset()
+                if self.history:
+                    self.history.point_scored(self, "Player")
                 self.check_win_condition()
 
-            self.ai.auto_track(self.ball, self.height)
+            self.ai_controller.update(self.ai, self.ball, self.height)
+            if self.multiball is not None:
+                self.multiball.step(self.player, self.ai)
+
+            # Don't interpolate the ball across the field after a reset
+            if point_scored:
+                self.ai_controller.reset()
+                if self.player_controller:
+                    self.player_controller.reset()
+                self.previous_positions = (self.ball.x, self.ball.y) + self.previous_positions[2:]
+
+    def snapshot(self):
+        """Simulation state packed into a few dozen bytes, for keyframes and rollback"""
+        ball = self.ball
+        ai_state = self.ai_controller.get_state()
+        player_state = self.player_controller.get_state() if self.player_controller else b""
+        return SNAPSHOT.pack(
+            ball.x, ball.y, ball.velocity_x, ball.velocity_y, self.player.y, self.ai.y,
+            self.player_score, self.ai_score, self.winning_score, self.series_length,
+            self.player_series_wins, self.ai_series_wins, self.games_played,
+            self.selected_match, GAME_STATES.index(self.game_state),
+            WINNERS.index(self.winner), WINNERS.index(self.series_winner),
+            self.player_direction, self.rng.getstate(),
+            self.rally_hits, self.last_rally_hits, len(ai_state),
+        ) + ai_state + player_state
+
+    def restore(self, data):
+        """Restore a state produced by snapshot()"""
+        ball = self.ball
+        (ball.x, ball.y, ball.velocity_x, ball.velocity_y, self.player.y, self.ai.y,
+         self.player_score, self.ai_score, self.winning_score, self.series_length,
+         self.player_series_wins, self.ai_series_wins, self.games_played,
+         self.selected_match, game_state, winner, series_winner,
+         self.player_direction, rng_state, self.rally_hits, self.last_rally_hits,
+         ai_state_size) = SNAPSHOT.unpack_from(data)
+        self.game_state = GAME_STATES[game_state]
+        self.winner = WINNERS[winner]
+        self.series_winner = WINNERS[series_winner]
+        self.rng.setstate(rng_state)
+        ai_state_end = SNAPSHOT.size + ai_state_size
+        self.ai_controller.set_state(data[SNAPSHOT.size:ai_state_end])
+        if self.player_controller:
+            self.player_controller.set_state(data[ai_state_end:])
+        self.previous_positions = self.positions()
+
+    def positions(self):
+        """Ball x/y and paddle y positions, used for render interpolation"""
+        return (self.ball.x, self.ball.y, self.player.y, self.ai.y)
+
+    def interpolated_rects(self):
+        """Player, AI and ball rects blended between the last two ticks"""
+        alpha = self.render_alpha
+        prev_x, prev_y, prev_player_y, prev_ai_y = self.previous_positions
+        ball_x = prev_x + (self.ball.x - prev_x) * alpha
+        ball_y = prev_y + (self.ball.y - prev_y) * alpha
+        player_y = prev_player_y + (self.player.y - prev_player_y) * alpha
+        if self.player_input is not None and self.player_input.late_latch:
+            player_y = self.player.y  # Own paddle without the interpolation delay
+        ai_y = prev_ai_y + (self.ai.y - prev_ai_y) * alpha
+        return (pygame.Rect(self.player.x, player_y, self.player.width, self.player.height),
+                pygame.Rect(self.ai.x, ai_y, self.ai.width, self.ai.height),
+                pygame.Rect(ball_x, ball_y, self.ball.width, self.ball.height))
     
     def check_win_condition(self):
         """Check if either player has won the game"""
@@ -158,6 +339,9 @@ class GameEngine:
         elif self.ai_series_wins >= games_to_win:
             self.series_winner = "AI"
             self.game_state = "series_over"
+
+        if self.history:
+            self.history.game_finished(self, game_winner)
     
     def start_next_game(self):
         """Start the next game in the current series"""
@@ -166,28 +350,27 @@ class GameEngine:
         self.winner = None
         self.game_state = "playing"
         self.ball.reset()
+        self.ai_controller.reset()
+        if self.player_controller:
+            self.player_controller.reset()
+        self.rally_hits = 0
+        self.player_direction = 0
+        if self.player_input is not None:
+            self.player_input.resync()
+        self.previous_positions = self.positions()
+
+    def render_frame(self):
+        """Render the current state on the offscreen frame surface (render_mode="rgb_array")"""
+        self.frame.fill(BLACK)
+        self.render(self.frame)
+        return self.frame
 
     def render(self, screen):
         if self.game_state == "menu":
             self.render_menu(screen)
             
         elif self.game_state == "playing":
-            # Draw paddles and ball
-            pygame.draw.rect(screen, WHITE, self.player.rect())
-            pygame.draw.rect(screen, WHITE, self.ai.rect())
-            pygame.draw.ellipse(screen, WHITE, self.ball.rect())
-            pygame.draw.aaline(screen, WHITE, (self.width//2, 0), (self.width//2, self.height))
-
-            # Draw current game score
-            player_text = self.font.render(str(self.player_score), True, WHITE)
-            ai_text = self.font.render(str(self.ai_score), True, WHITE)
-            screen.blit(player_text, (self.width//4, 20))
-            screen.blit(ai_text, (self.width * 3//4, 20))
-            
-            # Draw series score
-            series_text = self.small_font.render(f"Series: P{self.player_series_wins} - {self.ai_series_wins}A | Game {self.games_played + 1}/{self.series_length}", True, WHITE)
-            series_rect = series_text.get_rect(center=(self.width//2, 60))
-            screen.blit(series_text, series_rect)
+            self.render_playing(screen)
         
         elif self.game_state == "game_over":
             self.render_game_over(screen)
@@ -195,183 +378,110 @@ class GameEngine:
         elif self.game_state == "series_over":
             self.render_series_over(screen)
     
+    def render_playing(self, screen):
+        """Render the paddles, ball and scores; returns the rects drawn (the net line aside)"""
+        # Draw paddles and ball
+        player_rect, ai_rect, ball_rect = self.interpolated_rects()
+        drawn = [pygame.draw.rect(screen, WHITE, player_rect),
+                 pygame.draw.rect(screen, WHITE, ai_rect),
+                 pygame.draw.ellipse(screen, WHITE, ball_rect)]
+        if self.multiball is not None:
+            drawn += self.multiball.draw(screen, self.render_alpha)
+        pygame.draw.aaline(screen, WHITE, (self.width//2, 0), (self.width//2, self.height))
+
+        # Draw current game score
+        player_text = self.text_cache.render(self.font, str(self.player_score), True, WHITE)
+        ai_text = self.text_cache.render(self.font, str(self.ai_score), True, WHITE)
+        drawn.append(screen.blit(player_text, (self.width//4, 20)))
+        drawn.append(screen.blit(ai_text, (self.width * 3//4, 20)))
+
+        # Draw series score
+        series_text = self.text_cache.render(self.small_font, f"Series: P{self.player_series_wins} - {self.ai_series_wins}A | Game {self.games_played + 1}/{self.series_length}", True, WHITE)
+        series_rect = series_text.get_rect(center=(self.width//2, 60))
+        drawn.append(screen.blit(series_text, series_rect))
+        return drawn
+
     def render_game_over(self, screen):
         """Render the game over screen"""
         # Semi-transparent overlay
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        screen.blit(overlay, (0, 0))
+        screen.blit(self.text_cache.overlay((self.width, self.height), 128), (0, 0))
         
         # Winner announcement
         winner_color = GREEN if self.winner == "Player" else RED
-        winner_text = self.big_font.render(f"{self.winner} Wins Game!", True, winner_color)
+        winner_text = self.text_cache.render(self.big_font, f"{self.winner} Wins Game!", True, winner_color)
         winner_rect = winner_text.get_rect(center=(self.width//2, self.height//2 - 100))
         screen.blit(winner_text, winner_rect)
         
         # Game score
-        score_text = self.font.render(f"Game Score: {self.player_score} - {self.ai_score}", True, WHITE)
+        score_text = self.text_cache.render(self.font, f"Game Score: {self.player_score} - {self.ai_score}", True, WHITE)
         score_rect = score_text.get_rect(center=(self.width//2, self.height//2 - 60))
         screen.blit(score_text, score_rect)
         
         # Series progress
-        series_text = self.font.render(f"Series Score: Player {self.player_series_wins} - {self.ai_series_wins} AI", True, WHITE)
+        series_text = self.text_cache.render(self.font, f"Series Score: Player {self.player_series_wins} - {self.ai_series_wins} AI", True, WHITE)
         series_rect = series_text.get_rect(center=(self.width//2, self.height//2 - 20))
         screen.blit(series_text, series_rect)
         
         # Game progress
-        progress_text = self.small_font.render(f"Game {self.games_played} of {self.series_length} (Best of {self.series_length})", True, WHITE)
+        progress_text = self.text_cache.render(self.small_font, f"Game {self.games_played} of {self.series_length} (Best of {self.series_length})", True, WHITE)
         progress_rect = progress_text.get_rect(center=(self.width//2, self.height//2 + 10))
         screen.blit(progress_text, progress_rect)
         
         # Instructions
         if self.series_winner is None:  # Series not over yet
-            next_text = self.small_font.render("Press SPACE for next game, 'R' for new series, or 'ESC' to quit", True, WHITE)
+            next_text = self.text_cache.render(self.small_font, "Press SPACE for next game, 'R' for new series, or 'ESC' to quit", True, WHITE)
         else:
-            next_text = self.small_font.render("Press 'R' for new series or 'ESC' to quit", True, WHITE)
+            next_text = self.text_cache.render(self.small_font, "Press 'R' for new series or 'ESC' to quit", True, WHITE)
         next_rect = next_text.get_rect(center=(self.width//2, self.height//2 + 50))
         screen.blit(next_text, next_rect)
     
     def render_series_over(self, screen):
         """Render the series completion screen"""
         # Semi-transparent overlay
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        screen.blit(overlay, (0, 0))
+        screen.blit(self.text_cache.overlay((self.width, self.height), 128), (0, 0))
         
         # Series winner announcement
         winner_color = GREEN if self.series_winner == "Player" else RED
-        winner_text = self.big_font.render(f"{self.series_winner} Wins Series!", True, winner_color)
+        winner_text = self.text_cache.render(self.big_font, f"{self.series_winner} Wins Series!", True, winner_color)
         winner_rect = winner_text.get_rect(center=(self.width//2, self.height//2 - 80))
         screen.blit(winner_text, winner_rect)
         
         # Final series score
-        series_text = self.font.render(f"Final Series Score: Player {self.player_series_wins} - {self.ai_series_wins} AI", True, WHITE)
+        series_text = self.text_cache.render(self.font, f"Final Series Score: Player {self.player_series_wins} - {self.ai_series_wins} AI", True, WHITE)
         series_rect = series_text.get_rect(center=(self.width//2, self.height//2 - 20))
         screen.blit(series_text, series_rect)
         
         # Series type
-        series_type_text = self.small_font.render(f"Best of {self.series_length} Series Complete", True, WHITE)
+        series_type_text = self.text_cache.render(self.small_font, f"Best of {self.series_length} Series Complete", True, WHITE)
         series_type_rect = series_type_text.get_rect(center=(self.width//2, self.height//2 + 10))
         screen.blit(series_type_text, series_type_rect)
         
         # Instructions
-        restart_text = self.small_font.render("Press 'R' to start new series or 'ESC' to quit", True, WHITE)
+        restart_text = self.text_cache.render(self.small_font, "Press 'R' to start new series or 'ESC' to quit", True, WHITE)
         restart_rect = restart_text.get_rect(center=(self.width//2, self.height//2 + 50))
         screen.blit(restart_text, restart_rect)
     
-    def generate_sounds(self):
-        """Generate simple sound effects using numpy"""
-        try:
-            import pygame.sndarray
-            sample_rate = 22050
-            
-            print("Generating sound effects...")
-            
-            # Generate paddle hit sound (short beep at 800Hz)
-            duration = 0.15
-            frequency = 800
-            t = np.linspace(0, duration, int(sample_rate * duration), False)
-            paddle_wave = np.sin(frequency * 2 * np.pi * t) * 0.5
-            # Add slight decay
-            envelope = np.exp(-t * 8)
-            paddle_wave *= envelope
-            # Create stereo sound and ensure C-contiguous
-            paddle_sound = np.column_stack((paddle_wave, paddle_wave))
-            paddle_sound = np.ascontiguousarray((paddle_sound * 32767).astype(np.int16))
-            self.paddle_sound = pygame.sndarray.make_sound(paddle_sound)
-            print("Paddle sound generated")
-            
-            # Generate wall bounce sound (lower pitch at 300Hz)
-            frequency = 300
-            t_wall = np.linspace(0, duration, int(sample_rate * duration), False)
-            wall_wave = np.sin(frequency * 2 * np.pi * t_wall) * 0.4
-            wall_wave *= np.exp(-t_wall * 8)
-            wall_sound = np.column_stack((wall_wave, wall_wave))
-            wall_sound = np.ascontiguousarray((wall_sound * 32767).astype(np.int16))
-            self.wall_sound = pygame.sndarray.make_sound(wall_sound)
-            print("Wall bounce sound generated")
-            
-            # Generate score sound (ascending chord)
-            duration = 0.5
-            t_score = np.linspace(0, duration, int(sample_rate * duration), False)
-            # Create a chord with multiple frequencies
-            freq1, freq2 = 440, 554  # A and C# notes
-            score_wave = (np.sin(freq1 * 2 * np.pi * t_score) + 
-                         np.sin(freq2 * 2 * np.pi * t_score)) * 0.3
-            # Add envelope for smooth fade
-            envelope = np.exp(-t_score * 3)
-            score_wave *= envelope
-            score_sound = np.column_stack((score_wave, score_wave))
-            score_sound = np.ascontiguousarray((score_sound * 32767).astype(np.int16))
-            self.score_sound = pygame.sndarray.make_sound(score_sound)
-            print("Score sound generated")
-            
-            # Generate menu navigation sound (short click)
-            duration = 0.08
-            frequency = 1200
-            t_click = np.linspace(0, duration, int(sample_rate * duration), False)
-            click_wave = np.sin(frequency * 2 * np.pi * t_click) * 0.3
-            click_wave *= np.exp(-t_click * 15)  # Quick decay
-            click_sound = np.column_stack((click_wave, click_wave))
-            click_sound = np.ascontiguousarray((click_sound * 32767).astype(np.int16))
-            self.click_sound = pygame.sndarray.make_sound(click_sound)
-            print("Click sound generated")
-            
-            print("All sounds generated successfully!")
-            
-            # Set volume levels
-            self.paddle_sound.set_volume(0.7)
-            self.wall_sound.set_volume(0.5)
-            self.score_sound.set_volume(0.8)
-            self.click_sound.set_volume(0.6)
-            
-        except Exception as e:
-            print(f"Could not generate sounds: {e}")
-            import traceback
-            traceback.print_exc()
-            self.sounds_enabled = False
-    
     def play_sound(self, sound_type):
-        """Play a sound effect"""
-        if not self.sounds_enabled:
-            print(f"Sounds disabled, cannot play {sound_type}")
-            return
-            
-        try:
-            print(f"Playing {sound_type} sound")
-            if sound_type == "paddle" and hasattr(self, 'paddle_sound'):
-                self.paddle_sound.play()
-            elif sound_type == "wall" and hasattr(self, 'wall_sound'):
-                self.wall_sound.play()
-            elif sound_type == "score" and hasattr(self, 'score_sound'):
-                self.score_sound.play()
-            elif sound_type == "click" and hasattr(self, 'click_sound'):
-                self.click_sound.play()
-            else:
-                print(f"Sound {sound_type} not found or not loaded")
-        except Exception as e:
-            print(f"Error playing sound {sound_type}: {e}")
-            import traceback
-            traceback.print_exc()
+        """Queue a sound effect; it plays at the next AudioDispatcher.drain()"""
+        if self.audio is not None and not self.muted:
+            self.audio.push(sound_type, math.hypot(self.ball.velocity_x, self.ball.velocity_y))
     
     def render_menu(self, screen):
         """Render the match selection menu"""
         # Title
-        title_text = self.big_font.render("PING PONG", True, WHITE)
+        title_text = self.text_cache.render(self.big_font, "PING PONG", True, WHITE)
         title_rect = title_text.get_rect(center=(self.width//2, self.height//2 - 120))
         screen.blit(title_text, title_rect)
         
         # Subtitle
-        subtitle_text = self.font.render("Choose Match Type:", True, WHITE)
+        subtitle_text = self.text_cache.render(self.font, "Choose Match Type:", True, WHITE)
         subtitle_rect = subtitle_text.get_rect(center=(self.width//2, self.height//2 - 60))
         screen.blit(subtitle_text, subtitle_rect)
         
         # Match options
         for i, option in enumerate(self.match_options):
             color = GREEN if i == self.selected_match else WHITE
-            option_text = self.font.render(f"Best of {option}", True, color)
+            option_text = self.text_cache.render(self.font, f"Best of {option}", True, color)
             option_rect = option_text.get_rect(center=(self.width//2, self.height//2 - 10 + i * 40))
             screen.blit(option_text, option_rect)
             
@@ -388,6 +498,6 @@ class GameEngine:
         ]
         
         for i, instruction in enumerate(instructions):
-            inst_text = self.small_font.render(instruction, True, WHITE)
+            inst_text = self.text_cache.render(self.small_font, instruction, True, WHITE)
             inst_rect = inst_text.get_rect(center=(self.width//2, self.height//2 + 80 + i * 25))
             screen.blit(inst_text, inst_rect)
@@ -0,0 +1,328 @@
+import argparse
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Match history
+#
+# Every point, game and series is stored in SQLite. The engine's hooks only
+# put a tuple on a queue; a writer thread owns the database connection and
+# commits in batches, so the frame path never touches the disk. Per-player
+# totals for the leaderboard are loaded once by the writer and then updated
+# in memory as each batch is committed, so reading them needs no query.
+
+BATCH_SIZE = 64  # Rows per commit at most
+FLUSH_INTERVAL = 1.0  # Seconds a row may wait before it is committed
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    best_of INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    winner TEXT,
+    player_games INTEGER NOT NULL DEFAULT 0,
+    opponent_games INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    series_id INTEGER NOT NULL REFERENCES series(id),
+    number INTEGER NOT NULL,
+    finished_at REAL NOT NULL,
+    winner TEXT NOT NULL,
+    player_score INTEGER NOT NULL,
+    opponent_score INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS points (
+    id INTEGER PRIMARY KEY,
+    series_id INTEGER NOT NULL REFERENCES series(id),
+    game_number INTEGER NOT NULL,
+    scored_at REAL NOT NULL,
+    winner TEXT NOT NULL,
+    rally_hits INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS series_player ON series(player, winner);
+CREATE INDEX IF NOT EXISTS series_opponent ON series(opponent, winner);
+CREATE INDEX IF NOT EXISTS series_finished ON series(finished_at);
+CREATE INDEX IF NOT EXISTS games_series ON games(series_id);
+CREATE INDEX IF NOT EXISTS points_series ON points(series_id, game_number);
+"""
+
+# Per-name totals, one query per side of the table (each served by an index)
+TOTALS_QUERIES = (
+    """SELECT s.player, COUNT(*), SUM(s.winner = s.player), SUM(s.player_games), SUM(s.opponent_games)
+       FROM series s WHERE s.finished_at IS NOT NULL GROUP BY s.player""",
+    """SELECT s.opponent, COUNT(*), SUM(s.winner = s.opponent), SUM(s.opponent_games), SUM(s.player_games)
+       FROM series s WHERE s.finished_at IS NOT NULL GROUP BY s.opponent""",
+)
+POINT_TOTALS_QUERY = """
+    SELECT s.player, s.opponent, p.winner, COUNT(*), SUM(p.rally_hits), MAX(p.rally_hits)
+    FROM points p JOIN series s ON s.id = p.series_id
+    GROUP BY s.player, s.opponent, p.winner
+"""
+
+
+def default_path():
+    """$PINGPONG_HISTORY, or history.sqlite3 in ~/.local/share/pingpong"""
+    return os.environ.get("PINGPONG_HISTORY",
+                          os.path.join(os.path.expanduser("~"), ".local", "share", "pingpong",
+                                       "history.sqlite3"))
+
+
+def new_totals():
+    return {"series": 0, "series_won": 0, "games_won": 0, "games_lost": 0,
+            "points_won": 0, "points_lost": 0, "rally_hits": 0, "longest_rally": 0}
+
+
+class MatchHistory:
+    def __init__(self, path=None, player_name="Player"):
+        self.path = path or default_path()
+        self.player_name = player_name  # Name stored for the left paddle
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()  # Guards totals
+        self.totals = {}  # name -> new_totals() dict, kept in step with the database
+        self.loaded = threading.Event()  # Set once totals hold the stored history, or on error
+        self.error = None  # Why the database couldn't be opened or written; writing stops then
+        self.series_count = 0  # Series started in this session
+        self.rows_written = 0
+        self.commits = 0
+        self.thread = threading.Thread(target=self._run, name="match-history", daemon=True)
+        self.thread.start()
+
+    def attach(self, engine):
+        """Record every series played on engine from now on"""
+        engine.history = self
+        return self
+
+    # Hooks called by GameEngine; they only enqueue
+
+    def series_started(self, engine):
+        self.series_count += 1
+        self.queue.put(("series", self.series_count, time.time(), engine.series_length,
+                        self.player_name, engine.ai_controller.name))
+
+    def point_scored(self, engine, winner):
+        self.queue.put(("point", self.series_count, engine.games_played + 1, time.time(), winner,
+                        engine.last_rally_hits))
+
+    def game_finished(self, engine, winner):
+        self.queue.put(("game", self.series_count, engine.games_played, time.time(), winner,
+                        engine.player_score, engine.ai_score, engine.player_series_wins,
+                        engine.ai_series_wins, engine.series_winner))
+
+    def close(self):
+        """Commit everything queued and stop the writer; returns the write error, if any"""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        return self.error
+
+    # Reads, answered from memory
+
+    def _wait_loaded(self):
+        self.loaded.wait()
+        if self.error is not None:
+            raise self.error
+
+    def player_stats(self, name):
+        """Totals for one name (the player name or an AI controller name)"""
+        self._wait_loaded()
+        with self.lock:
+            return dict(self.totals.get(name) or new_totals())
+
+    def leaderboard(self, limit=10):
+        """(name, totals) pairs ordered by series won, then win rate"""
+        self._wait_loaded()
+        with self.lock:
+            rows = [(name, dict(totals)) for name, totals in self.totals.items()]
+        rows.sort(key=lambda row: (-row[1]["series_won"],
+                                   -row[1]["series_won"] / max(1, row[1]["series"])))
+        return rows[:limit]
+
+    # Writer thread
+
+    def _run(self):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            self._load_totals(connection)
+        except (OSError, sqlite3.Error) as e:
+            self.error = e  # Readers raise it; hooks keep queueing into the void
+            return
+        finally:
+            self.loaded.set()
+
+        series_ids = {}  # Session series number -> row id
+        opponents = {}  # Session series number -> (player, opponent)
+        finished = set()  # Session series numbers that already have a winner
+        pending = 0
+        deltas = []  # Totals updates for the rows in the open transaction
+        last_commit = time.monotonic()
+        running = True
+        while running:
+            timeout = max(0.0, FLUSH_INTERVAL - (time.monotonic() - last_commit))
+            try:
+                item = self.queue.get(timeout=timeout if pending else None)
+            except queue.Empty:
+                item = False
+            if item is None:
+                running = False
+            elif item and self.error is None:
+                try:
+                    self._write(connection, item, series_ids, opponents, finished, deltas)
+                    pending += 1
+                except sqlite3.Error as e:
+                    self._fail(connection, e)
+                    pending = 0
+                    deltas = []
+            # After a failure items are still taken off the queue, but dropped
+            if pending and (not running or pending >= BATCH_SIZE or item is False
+                            or time.monotonic() - last_commit >= FLUSH_INTERVAL):
+                try:
+                    connection.commit()
+                except sqlite3.Error as e:
+                    self._fail(connection, e)
+                else:
+                    self._apply(deltas)
+                    self.rows_written += pending
+                    self.commits += 1
+                pending = 0
+                deltas = []
+                last_commit = time.monotonic()
+        connection.close()
+
+    def _fail(self, connection, error):
+        """Give up writing: drop the open transaction so totals keep matching the database"""
+        try:
+            connection.rollback()
+        except sqlite3.Error:
+            pass
+        self.error = error
+        print(f"Match history stopped recording: {error}")
+
+    def _write(self, connection, item, series_ids, opponents, finished, deltas):
+        kind, series = item[0], item[1]
+        if kind == "series":
+            _, _, started_at, best_of, player, opponent = item
+            cursor = connection.execute(
+                "INSERT INTO series (started_at, best_of, player, opponent) VALUES (?, ?, ?, ?)",
+                (started_at, best_of, player, opponent))
+            series_ids[series] = cursor.lastrowid
+            opponents[series] = (player, opponent)
+        elif series not in series_ids:
+            return  # Its series row was never stored
+        elif kind == "point":
+            _, _, game_number, scored_at, winner, rally_hits = item
+            connection.execute(
+                "INSERT INTO points (series_id, game_number, scored_at, winner, rally_hits) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (series_ids[series], game_number, scored_at, winner, rally_hits))
+            player, opponent = opponents[series]
+            won, lost = (player, opponent) if winner == "Player" else (opponent, player)
+            deltas.append((won, {"points_won": 1, "rally_hits": rally_hits}, rally_hits))
+            deltas.append((lost, {"points_lost": 1, "rally_hits": rally_hits}, rally_hits))
+        elif kind == "game":
+            (_, _, number, finished_at, winner, player_score, opponent_score,
+             player_games, opponent_games, series_winner) = item
+            series_id = series_ids[series]
+            connection.execute(
+                "INSERT INTO games (series_id, number, finished_at, winner, player_score, opponent_score) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (series_id, number, finished_at, winner, player_score, opponent_score))
+            if series in finished:
+                # Games played on after the series was decided (SPACE on the
+                # game over screen) are kept, but the series result stays put
+                return
+            player, opponent = opponents[series]
+            names = {"Player": player, "AI": opponent}
+            connection.execute(
+                "UPDATE series SET player_games = ?, opponent_games = ?, winner = ?, finished_at = ? "
+                "WHERE id = ?",
+                (player_games, opponent_games, names.get(series_winner),
+                 finished_at if series_winner else None, series_id))
+            if series_winner:
+                finished.add(series)
+                # Series totals count finished series only, like TOTALS_QUERIES
+                for name, won, lost in ((player, player_games, opponent_games),
+                                        (opponent, opponent_games, player_games)):
+                    deltas.append((name, {"series": 1, "series_won": int(name == names[series_winner]),
+                                          "games_won": won, "games_lost": lost}, 0))
+
+    def _apply(self, deltas):
+        with self.lock:
+            for name, changes, rally in deltas:
+                totals = self.totals.setdefault(name, new_totals())
+                for key, value in changes.items():
+                    totals[key] += value
+                totals["longest_rally"] = max(totals["longest_rally"], rally)
+
+    def _load_totals(self, connection):
+        totals = {}
+        for query in TOTALS_QUERIES:
+            for name, series, series_won, games_won, games_lost in connection.execute(query):
+                entry = totals.setdefault(name, new_totals())
+                entry["series"] += series
+                entry["series_won"] += series_won or 0
+                entry["games_won"] += games_won or 0
+                entry["games_lost"] += games_lost or 0
+        for player, opponent, winner, count, rally_hits, longest in connection.execute(POINT_TOTALS_QUERY):
+            won, lost = (player, opponent) if winner == "Player" else (opponent, player)
+            for name, key in ((won, "points_won"), (lost, "points_lost")):
+                entry = totals.setdefault(name, new_totals())
+                entry[key] += count
+                entry["rally_hits"] += rally_hits or 0
+                entry["longest_rally"] = max(entry["longest_rally"], longest or 0)
+        with self.lock:
+            self.totals = totals
+
+
+def recent_series(path, limit=10):
+    """The latest finished series, newest first (reads the database directly)"""
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(
+            "SELECT finished_at, best_of, player, opponent, winner, player_games, opponent_games "
+            "FROM series WHERE finished_at IS NOT NULL ORDER BY finished_at DESC LIMIT ?",
+            (limit,)).fetchall()
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the match history leaderboard")
+    parser.add_argument("--db", default=None, help=f"history database (default {default_path()})")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    history = MatchHistory(args.db)
+    try:
+        leaders = history.leaderboard(args.limit)
+    except (OSError, sqlite3.Error) as e:
+        parser.exit(1, f"cannot read {history.path}: {e}\n")
+    print(f"{'name':<12}{'series':>8}{'won':>6}{'games':>10}{'points':>12}{'rally':>8}{'best':>6}")
+    for name, totals in leaders:
+        points = totals["points_won"] + totals["points_lost"]
+        rally = totals["rally_hits"] / points if points else 0.0
+        print(f"{name:<12}{totals['series']:>8}{totals['series_won']:>6}"
+              f"{totals['games_won']:>5}-{totals['games_lost']:<4}"
+              f"{totals['points_won']:>6}-{totals['points_lost']:<5}{rally:>8.2f}{totals['longest_rally']:>6}")
+    history.close()
+
+    print("\nRecent series:")
+    for finished_at, best_of, player, opponent, winner, player_games, opponent_games in \
+            recent_series(history.path, args.limit):
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(finished_at))
+        print(f"  {when}  best of {best_of}: {player} {player_games}-{opponent_games} {opponent}, "
+              f"{winner} won")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import os
+import random
+import time
+import pygame
+
+# Keyboard input for the player's paddle
+#
+# Sampling pygame.key.get_pressed() once per frame and moving whole ticks
+# adds up to two frames between a key press and the paddle moving on screen.
+# PaddleInput instead keeps a timeline of W/S changes, timestamped when they
+# are polled, and gives each simulation tick the mean direction over the
+# stretch of real time that tick stands for. Key events are polled once more
+# just before the simulation runs, and the player's own paddle is drawn at
+# its latest simulated position instead of being interpolated a tick behind.
+#
+# With render interpolation the last tick of a frame ends one tick minus the
+# leftover time after the moment input was sampled, so the ticks of a frame
+# cover contiguous windows of real time ending slightly in the future. Key
+# changes polled after a window was simulated count from the next window.
+
+KEYS = {pygame.K_w: -1, pygame.K_s: 1}
+INPUT_STEPS = 4  # Directions are multiples of 1/INPUT_STEPS so replays reproduce them exactly
+
+
+class PaddleInput:
+    def __init__(self, late_latch=True, clock=time.perf_counter):
+        self.late_latch = late_latch  # False: sample once per frame, like get_pressed()
+        self.clock = clock
+        self.held = dict.fromkeys(KEYS, False)
+        self.direction = 0  # From the keys held when last polled
+        self.base_direction = 0  # Direction before the first entry in changes
+        self.changes = []  # (time, direction) from each change on, oldest first
+        self.sampled_at = clock()
+        self.simulated_until = float("-inf")  # End of the last tick window handed out
+
+    def poll(self, events):
+        """Record the W/S presses and releases in events"""
+        now = self.clock()
+        for event in events:
+            if event.type not in (pygame.KEYDOWN, pygame.KEYUP) or event.key not in KEYS:
+                continue
+            self.held[event.key] = event.type == pygame.KEYDOWN
+            direction = sum(KEYS[key] for key, held in self.held.items() if held)
+            if direction != self.direction:
+                self.direction = direction
+                self.changes.append((max(now, self.simulated_until), direction))
+        self.sampled_at = now
+
+    def resync(self):
+        """Start over from the keys held now; presses and releases outside play were never polled"""
+        pressed = pygame.key.get_pressed()
+        self.held = {key: bool(pressed[key]) for key in KEYS}
+        self.direction = self.base_direction = sum(KEYS[key] for key, held in self.held.items() if held)
+        self.changes = []
+        self.sampled_at = self.clock()
+
+    def latch(self):
+        """Poll key events that arrived since the last poll, right before the simulation runs"""
+        events = pygame.event.get((pygame.KEYDOWN, pygame.KEYUP))
+        self.poll(events)
+        for event in events:
+            if event.key not in KEYS:
+                pygame.event.post(event)  # Handled with next frame's events
+
+    def tick_direction(self, start, end):
+        """Direction for the tick standing for real time start..end"""
+        if not self.late_latch:
+            return self.direction
+        # Forget changes from before this window
+        while self.changes and self.changes[0][0] <= start:
+            self.base_direction = self.changes.pop(0)[1]
+        total = 0.0
+        since = start
+        direction = self.base_direction
+        for changed_at, new_direction in self.changes:
+            if changed_at >= end:
+                break
+            total += direction * (changed_at - since)
+            since, direction = changed_at, new_direction
+        total += direction * (end - since)
+        self.simulated_until = end
+        return round(total / (end - start) * INPUT_STEPS) / INPUT_STEPS
+
+
+class VirtualClock:
+    """Settable time source, so latency tests don't depend on the machine's speed"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def measure_latency(late_latch, trials=200, fps=60, work=0.004, seed=0):
+    """Inject a synthetic S press at a random moment and time until the paddle moves
+
+    Frames start every 1/fps seconds of virtual time; polling happens at the
+    start of a frame and the late latch work/2 later; the frame is on screen
+    work seconds after it starts. Returns per-trial (ticks until the
+    simulation moved the paddle, milliseconds until a frame showed it).
+    """
+    from .game_engine import GameEngine
+
+    rng = random.Random(seed)
+    period = 1.0 / fps
+    results = []
+    for trial in range(trials):
+        clock = VirtualClock()
+        engine = GameEngine(800, 600, headless=True, seed=trial)
+        engine.player_input = PaddleInput(late_latch, clock)
+        engine.start_game()
+        pygame.event.clear()
+        start_y = engine.player.y
+        press_at = rng.uniform(0.1, 0.1 + period)
+        posted = False
+        ticks = 0
+        moved_after = None
+        frame = 0
+        while True:
+            frame_start = frame * period
+            # Frame start: the usual event poll
+            clock.now = frame_start
+            if not posted and press_at <= clock.now:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_s, mod=0))
+                posted = True
+            engine.handle_input(pygame.event.get())
+            # Just before the simulation runs: the late latch
+            clock.now = frame_start + work / 2
+            if not posted and press_at <= clock.now:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_s, mod=0))
+                posted = True
+            if late_latch:
+                engine.player_input.latch()
+
+            ran = engine.update(period)
+            if posted:
+                ticks += ran
+            if moved_after is None and engine.player.y != start_y:
+                moved_after = ticks
+            if int(engine.interpolated_rects()[0].y) != int(start_y):
+                shown_ms = (frame_start + work - press_at) * 1000
+                break
+            frame += 1
+        results.append((moved_after, shown_ms))
+    return results
+
+
+def main():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    for label, late_latch in (("sampled per frame", False), ("late-latched", True)):
+        results = measure_latency(late_latch)
+        ticks = sorted(result[0] for result in results)
+        shown = sorted(result[1] for result in results)
+        print(f"{label:<18} paddle moves after {sum(ticks) / len(ticks):.2f} ticks "
+              f"(max {ticks[-1]}), on screen after {sum(shown) / len(shown):.1f} ms "
+              f"(p95 {shown[int(0.95 * len(shown))]:.1f} ms)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import itertools
+import numpy as np
+import pygame
+
+# Many-ball stress mode
+#
+# Hundreds to thousands of extra balls that bounce off the walls, the paddles
+# and each other. State lives in NumPy arrays and every phase is vectorized.
+# Collision candidates come from a uniform grid: balls are sorted by the cell
+# holding their centre, so each cell's balls are one slice of the sort order.
+# Ball-ball pairs are only tested between a cell and its neighbours, and a
+# paddle only against the cells it covers. All balls are drawn with one
+# Surface.blits call from a single pre-rendered sprite.
+#
+# The extra balls never score: one that leaves the field comes back in at
+# the centre. Scoring, snapshots and replays only involve the engine's ball.
+
+MAX_VELOCITY_Y = 8
+# The cell itself (only later balls in it) and the neighbours after it, so
+# each pair of balls in adjacent cells is generated exactly once
+NEIGHBOURS = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+class MultiBall:
+    def __init__(self, count, width=800, height=600, size=7, seed=None):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.size = size  # Diameter; the balls are circles for ball-ball contacts
+        self.rng = np.random.default_rng(seed)
+
+        # Cells are one ball wide, so touching balls are in the same or adjacent cells
+        self.cell_size = size
+        self.columns = -(-width // size)
+        self.rows = -(-height // size)
+        self.cell_keys = np.arange(self.columns * self.rows + 1)
+
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.vx = np.zeros(count)
+        self.vy = np.zeros(count)
+        self.respawn(np.arange(count), spread=True)
+        self.previous_x = self.x.copy()
+        self.previous_y = self.y.copy()
+
+        # Last step's work, for benchmarks
+        self.pairs_tested = 0
+        self.contacts = 0
+
+        self.sprite = pygame.Surface((size, size))
+        self.sprite.set_colorkey((0, 0, 0))
+        pygame.draw.ellipse(self.sprite, (255, 255, 255), self.sprite.get_rect())
+
+    def attach(self, engine):
+        """Add these balls to engine's matches"""
+        engine.multiball = self
+        return self
+
+    def respawn(self, indices, spread=False):
+        """Serve balls again from the centre line (anywhere in the middle third if spread)"""
+        n = len(indices)
+        if spread:
+            self.x[indices] = self.rng.uniform(self.width / 3, self.width * 2 / 3, n)
+        else:
+            self.x[indices] = self.width // 2
+        self.y[indices] = self.rng.uniform(0, self.height - self.size, n)
+        self.vx[indices] = self.rng.choice([-1.0, 1.0], n) * self.rng.uniform(3, 6, n)
+        self.vy[indices] = self.rng.uniform(-3, 3, n)
+
+    def step(self, player, ai):
+        """Advance every ball by one tick"""
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+        x, y, vy = self.x, self.y, self.vy
+        x += self.vx
+        y += vy
+
+        top = y <= 0
+        y[top] = 0
+        vy[top] = np.abs(vy[top])
+        bottom = y + self.size >= self.height
+        y[bottom] = self.height - self.size
+        vy[bottom] = -np.abs(vy[bottom])
+
+        order, cell_start, cell_x, cell_y = self.build_grid()
+        self.collide_paddle(player, order, cell_start, left=True)
+        self.collide_paddle(ai, order, cell_start, left=False)
+        self.collide_balls(order, cell_start, cell_x, cell_y)
+
+        out = np.flatnonzero((x <= 0) | (x >= self.width))
+        if len(out):
+            self.respawn(out)
+            # Don't interpolate across the field
+            self.previous_x[out] = x[out]
+            self.previous_y[out] = y[out]
+
+    def build_grid(self):
+        """Sort balls by cell; returns the order, each cell's start in it, and cell coordinates"""
+        radius = self.size / 2
+        cell_x = np.clip(((self.x + radius) // self.cell_size).astype(np.intp), 0, self.columns - 1)
+        cell_y = np.clip(((self.y + radius) // self.cell_size).astype(np.intp), 0, self.rows - 1)
+        keys = cell_y * self.columns + cell_x
+        order = np.argsort(keys, kind="stable")
+        cell_start = np.searchsorted(keys[order], self.cell_keys)
+        return order, cell_start, cell_x[order], cell_y[order]
+
+    def collide_paddle(self, paddle, order, cell_start, left):
+        """Ball.check_collision's bounce, for the balls in the cells the paddle covers"""
+        size = self.size
+        first_column = max(0, int(paddle.x - size) // self.cell_size)
+        last_column = min(self.columns - 1, int(paddle.x + paddle.width + size) // self.cell_size)
+        first_row = max(0, int(paddle.y - size) // self.cell_size)
+        last_row = min(self.rows - 1, int(paddle.y + paddle.height + size) // self.cell_size)
+        # The covered cells of a row are consecutive keys, so each row is one slice
+        candidates = np.concatenate([
+            order[cell_start[row * self.columns + first_column]:cell_start[row * self.columns + last_column + 1]]
+            for row in range(first_row, last_row + 1)
+        ])
+        if not len(candidates):
+            return
+
+        x = self.x[candidates]
+        y = self.y[candidates]
+        vx = self.vx[candidates]
+        # Rect truncates float coordinates, so do the same
+        ix = np.trunc(x)
+        iy = np.trunc(y)
+        paddle_x = int(paddle.x)
+        paddle_y = int(paddle.y)
+        overlaps = ((ix < paddle_x + paddle.width) & (ix + size > paddle_x) &
+                    (iy < paddle_y + paddle.height) & (iy + size > paddle_y))
+        if left:
+            hit = (vx < 0) & (x > paddle.x + paddle.width // 2) & overlaps
+        else:
+            hit = (vx > 0) & (x < paddle.x + paddle.width // 2) & overlaps
+        hits = candidates[hit]
+        if not len(hits):
+            return
+
+        self.vx[hits] = np.abs(self.vx[hits]) if left else -np.abs(self.vx[hits])
+        self.x[hits] = paddle.x + paddle.width if left else paddle.x - size
+        hit_pos = (self.y[hits] + size // 2 - paddle.y) / paddle.height
+        self.vy[hits] = np.clip(self.vy[hits] + (hit_pos - 0.5) * 3, -MAX_VELOCITY_Y, MAX_VELOCITY_Y)
+
+    def candidate_pairs(self, cell_start, cell_x, cell_y):
+        """Positions in the sort order of every pair of balls in the same or adjacent cells"""
+        n = len(cell_x)
+        positions = np.arange(n)
+        firsts = []
+        seconds = []
+        for dx, dy in NEIGHBOURS:
+            column = cell_x + dx
+            row = cell_y + dy
+            valid = (column >= 0) & (column < self.columns) & (row < self.rows)
+            key = np.where(valid, row * self.columns + column, 0)
+            end = np.where(valid, cell_start[key + 1], 0)
+            start = positions + 1 if (dx, dy) == (0, 0) else np.where(valid, cell_start[key], 0)
+            counts = np.maximum(end - start, 0)
+            total = int(counts.sum())
+            if not total:
+                continue
+            # Expand each ball's [start, end) range of partners into flat pair lists
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            firsts.append(np.repeat(positions, counts))
+            seconds.append(np.repeat(start, counts) + offsets)
+        if not firsts:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def collide_balls(self, order, cell_start, cell_x, cell_y):
+        """Elastic bounces between touching balls (equal masses)"""
+        first, second = self.candidate_pairs(cell_start, cell_x, cell_y)
+        self.pairs_tested = len(first)
+        i = order[first]
+        j = order[second]
+        dx = self.x[j] - self.x[i]
+        dy = self.y[j] - self.y[i]
+        distance_squared = dx * dx + dy * dy
+        touching = distance_squared < self.size * self.size
+        i, j, dx, dy = i[touching], j[touching], dx[touching], dy[touching]
+        self.contacts = len(i)
+        if not len(i):
+            return
+
+        distance = np.sqrt(distance_squared[touching])
+        coincident = distance == 0
+        distance[coincident] = 1.0
+        dx[coincident] = 1.0  # Push exactly overlapping balls apart sideways
+        nx = dx / distance
+        ny = dy / distance
+
+        # Exchange the velocity components along the normal if the balls approach
+        approach = (self.vx[i] - self.vx[j]) * nx + (self.vy[i] - self.vy[j]) * ny
+        approach = np.maximum(approach, 0.0)
+        np.subtract.at(self.vx, i, approach * nx)
+        np.subtract.at(self.vy, i, approach * ny)
+        np.add.at(self.vx, j, approach * nx)
+        np.add.at(self.vy, j, approach * ny)
+
+        # Separate them by half the overlap each
+        push = (self.size - distance) / 2
+        np.subtract.at(self.x, i, push * nx)
+        np.subtract.at(self.y, i, push * ny)
+        np.add.at(self.x, j, push * nx)
+        np.add.at(self.y, j, push * ny)
+        np.clip(self.y, 0, self.height - self.size, out=self.y)
+        np.clip(self.vy, -MAX_VELOCITY_Y, MAX_VELOCITY_Y, out=self.vy)
+
+    def draw(self, screen, alpha=1.0):
+        """Blit every ball at its interpolated position; returns the rects drawn"""
+        x = (self.previous_x + (self.x - self.previous_x) * alpha).astype(np.intp)
+        y = (self.previous_y + (self.y - self.previous_y) * alpha).astype(np.intp)
+        return screen.blits(zip(itertools.repeat(self.sprite), zip(x.tolist(), y.tolist())))
+
+
+def measure(count, ticks=300):
+    """Milliseconds per tick for simulating and drawing count balls"""
+    import time
+    from .paddle import Paddle
+
+    screen = pygame.Surface((800, 600))
+    balls = MultiBall(count, seed=0)
+    player = Paddle(10, 250, 10, 100)
+    ai = Paddle(780, 250, 10, 100)
+    step_time = draw_time = 0.0
+    pairs = 0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        balls.step(player, ai)
+        middle = time.perf_counter()
+        screen.fill((0, 0, 0))
+        balls.draw(screen)
+        step_time += middle - start
+        draw_time += time.perf_counter() - middle
+        pairs += balls.pairs_tested
+    return {
+        "step_ms": step_time / ticks * 1000,
+        "draw_ms": draw_time / ticks * 1000,
+        "pairs_per_tick": pairs / ticks,
+        "brute_force_pairs": count * (count - 1) // 2,
+    }
+
+
+if __name__ == "__main__":
+    print(f"{'balls':>6}{'step ms':>10}{'draw ms':>10}{'pairs tested':>14}{'all pairs':>12}")
+    for count in (100, 250, 500, 1000, 2000, 4000):
+        result = measure(count)
+        print(f"{count:>6}{result['step_ms']:>10.2f}{result['draw_ms']:>10.2f}"
+              f"{result['pairs_per_tick']:>14.0f}{result['brute_force_pairs']:>12}")
@@ -0,0 +1,430 @@
+import argparse
+import asyncio
+import os
+import random
+import struct
+import time
+from collections import deque
+from .ai import InputController
+from .game_engine import GameEngine, TICK_TIME, PLAYER_SPEED
+
+# Two-player online mode with rollback netcode
+#
+# Both peers run the same deterministic GameEngine: the left paddle is the
+# engine's player, the right one an InputController. Each tick a peer sends
+# its own input (scheduled input_delay ticks ahead) over UDP and simulates
+# immediately, predicting the remote input as "same as last confirmed". When
+# the real remote input for a past tick arrives and differs from the
+# prediction, the session restores the snapshot taken before that tick and
+# re-simulates up to the present.
+
+DEFAULT_PORT = 5555
+MAX_ROLLBACK = 30  # Ticks a peer may run ahead of the last confirmed remote input
+MAX_INPUTS_PER_PACKET = 64
+
+HELLO = 1
+START = 2
+INPUT = 3
+HELLO_PACKET = struct.Struct("<B")
+START_PACKET = struct.Struct("<BQBB")  # type, seed, selected_match, input_delay
+# type, ack (last contiguous remote tick received), first_tick, sent_at,
+# echoed sent_at, time the echoed packet was held, input count; then the
+# inputs as signed bytes
+INPUT_HEADER = struct.Struct("<BiIdddB")
+
+
+class RollbackSession:
+    """Transport-independent rollback state for one peer"""
+
+    def __init__(self, engine, local_side, input_delay=2, max_rollback=MAX_ROLLBACK):
+        self.engine = engine
+        self.local_side = local_side  # "left" or "right"
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.tick = 0  # Next tick to simulate
+
+        # Nobody has input for the first input_delay ticks
+        self.local_inputs = {tick: 0 for tick in range(input_delay)}
+        self.remote_inputs = {tick: 0 for tick in range(input_delay)}
+        self.remote_confirmed = input_delay - 1  # Every remote tick up to here is known
+        self.predicted = {}  # tick -> remote input guessed when it was simulated
+        self.snapshots = {}  # tick -> engine state before that tick
+        self.rollback_from = None  # Earliest mispredicted tick, if any
+        self.series_ended_at = None  # Tick whose simulation ended the series, if any
+
+        self.rollbacks = 0
+        self.resimulated_ticks = 0
+        self.resimulation_time = 0.0
+        self.max_rollback_depth = 0
+        self.stalls = 0
+
+    def set_local_input(self, direction):
+        """Schedule this tick's local input; returns the tick it applies to"""
+        tick = self.tick + self.input_delay
+        # Inputs already sent to the peer must never change
+        self.local_inputs.setdefault(tick, direction)
+        return tick
+
+    def receive_remote(self, first_tick, inputs):
+        for offset, direction in enumerate(inputs):
+            tick = first_tick + offset
+            if tick <= self.remote_confirmed or tick in self.remote_inputs:
+                continue  # Resent, and possibly already pruned
+            self.remote_inputs[tick] = direction
+            if tick < self.tick and self.predicted.get(tick) != direction:
+                if self.rollback_from is None or tick < self.rollback_from:
+                    self.rollback_from = tick
+        while self.remote_confirmed + 1 in self.remote_inputs:
+            self.remote_confirmed += 1
+
+    def finished(self):
+        """True once the series ended on a tick no rollback can change"""
+        return self.series_ended_at is not None and self.series_ended_at <= self.remote_confirmed
+
+    def can_advance(self):
+        return self.tick - self.remote_confirmed <= self.max_rollback
+
+    def advance(self):
+        """Fix any misprediction, then simulate one new tick (False if stalled)"""
+        self.resolve()
+        if not self.can_advance():
+            self.stalls += 1
+            return False
+        self._simulate_tick()
+        return True
+
+    def resolve(self):
+        """Roll back and re-simulate if a confirmed input contradicted a prediction"""
+        if self.rollback_from is None:
+            return
+        start = time.perf_counter()
+        target = self.tick
+        self.tick = self.rollback_from
+        self.rollback_from = None
+        self.engine.restore(self.snapshots[self.tick])
+        if self.series_ended_at is not None and self.series_ended_at >= self.tick:
+            self.series_ended_at = None  # Re-simulation decides again
+        self.engine.muted = True
+        depth = target - self.tick
+        while self.tick < target:
+            self._simulate_tick()
+        self.engine.muted = False
+
+        self.rollbacks += 1
+        self.resimulated_ticks += depth
+        self.max_rollback_depth = max(self.max_rollback_depth, depth)
+        self.resimulation_time += time.perf_counter() - start
+
+    def _simulate_tick(self):
+        tick = self.tick
+        engine = self.engine
+        self.snapshots[tick] = engine.snapshot()
+        self.snapshots.pop(tick - self.max_rollback - 1, None)
+        # Inputs are kept long enough to re-simulate a rollback and to be resent
+        expired = tick - max(self.max_rollback, MAX_INPUTS_PER_PACKET) - 1
+        self.local_inputs.pop(expired, None)
+        self.remote_inputs.pop(expired, None)
+        self.predicted.pop(expired, None)
+
+        remote = self.remote_inputs.get(tick)
+        if remote is None:
+            # Nothing is confirmed yet when there is no input delay
+            remote = self.remote_inputs.get(self.remote_confirmed, 0)
+            self.predicted[tick] = remote
+        else:
+            self.predicted.pop(tick, None)
+        local = self.local_inputs.get(tick, 0)
+        left, right = (local, remote) if self.local_side == "left" else (remote, local)
+
+        # No one presses SPACE online: the next game of the series starts at once
+        if engine.game_state == "game_over" and engine.series_winner is None:
+            engine.start_next_game()
+        engine.player_direction = left
+        engine.ai_controller.direction = right
+        ongoing = engine.series_winner is None
+        engine.step()
+        if ongoing and engine.series_winner is not None:
+            self.series_ended_at = tick
+        self.tick += 1
+
+    def stats(self):
+        ticks = max(1, self.tick)
+        return {
+            "ticks": self.tick,
+            "rollbacks": self.rollbacks,
+            "rollbacks_per_100_ticks": self.rollbacks * 100 / ticks,
+            "mean_rollback_depth": self.resimulated_ticks / self.rollbacks if self.rollbacks else 0.0,
+            "max_rollback_depth": self.max_rollback_depth,
+            "resimulation_ms_total": self.resimulation_time * 1000,
+            "resimulation_ms_per_rollback": (self.resimulation_time * 1000 / self.rollbacks
+                                             if self.rollbacks else 0.0),
+            "stalls": self.stalls,
+        }
+
+
+class NetplayPeer(asyncio.DatagramProtocol):
+    """UDP transport for a RollbackSession, with optional simulated latency and loss"""
+
+    def __init__(self, session=None, remote_addr=None, latency=0.0, jitter=0.0, loss=0.0, seed=None):
+        self.session = session
+        self.remote_addr = remote_addr
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.transport = None
+        self.remote_ack = session.input_delay - 1 if session else -1
+        self.last_remote_sent_at = 0.0
+        self.last_remote_received_at = 0.0
+        self.rtt_samples = deque(maxlen=120)
+        self.packets_sent = 0
+        self.packets_dropped = 0
+        self.start_info = None
+        self.started = asyncio.Event()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def send(self, data, addr=None):
+        addr = addr or self.remote_addr
+        self.packets_sent += 1
+        if self.loss and self.rng.random() < self.loss:
+            self.packets_dropped += 1
+            return
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self.transport.sendto, data, addr)
+        else:
+            self.transport.sendto(data, addr)
+
+    def datagram_received(self, data, addr):
+        kind = data[0]
+        if kind == INPUT and self.session:
+            (_, ack, first_tick, sent_at, echo_sent_at, echo_hold,
+             count) = INPUT_HEADER.unpack_from(data)
+            inputs = struct.unpack_from(f"<{count}b", data, INPUT_HEADER.size)
+            now = time.perf_counter()
+            if sent_at > self.last_remote_sent_at:
+                self.last_remote_sent_at = sent_at
+                self.last_remote_received_at = now
+            if echo_sent_at:
+                self.rtt_samples.append(now - echo_sent_at - echo_hold)
+            self.remote_ack = max(self.remote_ack, ack)
+            self.session.receive_remote(first_tick, inputs)
+        elif kind == HELLO and self.start_info is not None:
+            # Host: (re)send the match settings until the guest starts ticking
+            self.remote_addr = addr
+            self.send(START_PACKET.pack(START, *self.start_info), addr)
+            self.started.set()
+        elif kind == START and self.start_info is None:
+            _, seed, selected_match, input_delay = START_PACKET.unpack_from(data)
+            self.start_info = (seed, selected_match, input_delay)
+            self.started.set()
+
+    def send_inputs(self):
+        """Send every local input the peer hasn't acknowledged yet"""
+        session = self.session
+        last = session.tick + session.input_delay
+        first = max(self.remote_ack + 1, last - MAX_INPUTS_PER_PACKET + 1)
+        inputs = [session.local_inputs.get(tick, 0) for tick in range(first, last + 1)]
+        now = time.perf_counter()
+        echo_hold = now - self.last_remote_received_at if self.last_remote_sent_at else 0.0
+        packet = INPUT_HEADER.pack(INPUT, session.remote_confirmed, first, now,
+                                   self.last_remote_sent_at, echo_hold, len(inputs))
+        self.send(packet + struct.pack(f"<{len(inputs)}b", *inputs))
+
+    def stats(self):
+        samples = self.rtt_samples
+        result = self.session.stats()
+        result.update({
+            "rtt_ms_mean": sum(samples) / len(samples) * 1000 if samples else 0.0,
+            "rtt_ms_last": samples[-1] * 1000 if samples else 0.0,
+            "packets_sent": self.packets_sent,
+            "packets_dropped": self.packets_dropped,
+        })
+        return result
+
+    async def run(self, input_source, ticks=None, on_tick=None, tick_time=TICK_TIME):
+        """Tick at tick_time until the series ends or ticks have been simulated
+
+        input_source(session) returns the local direction for the next input.
+        on_tick(session) is called after every loop iteration (e.g. to render);
+        it may return False to stop.
+        """
+        session = self.session
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        while ticks is None or session.tick < ticks:
+            if session.finished():
+                break
+            session.set_local_input(input_source(session))
+            self.send_inputs()
+            session.advance()
+            if on_tick and on_tick(session) is False:
+                return
+            next_time += tick_time
+            await asyncio.sleep(max(0.0, next_time - loop.time()))
+
+        # Keep exchanging until both sides have confirmed every input
+        last = session.tick - 1
+        while session.remote_confirmed < last or self.remote_ack < last:
+            self.send_inputs()
+            await asyncio.sleep(tick_time)
+        session.resolve()
+
+
+def create_session(seed, selected_match, local_side, input_delay, headless=True):
+    engine = GameEngine(800, 600, headless=headless, ai_controller=InputController(PLAYER_SPEED), seed=seed)
+    engine.selected_match = selected_match
+    engine.start_game()
+    return RollbackSession(engine, local_side, input_delay)
+
+
+def random_walk_input(seed):
+    """Input source that holds a random direction for a random number of ticks"""
+    rng = random.Random(seed)
+    state = {"direction": 0, "left": 0}
+
+    def source(session):
+        if state["left"] <= 0:
+            state["direction"] = rng.choice((-1, 0, 1))
+            state["left"] = rng.randint(5, 40)
+        state["left"] -= 1
+        return state["direction"]
+    return source
+
+
+async def run_local_match(ticks=600, latency=0.05, jitter=0.01, loss=0.1, input_delay=2,
+                          tick_time=TICK_TIME, seed=1):
+    """Two peers over localhost with simulated latency and loss
+
+    Returns both peers' stats and whether their final states are identical.
+    """
+    loop = asyncio.get_running_loop()
+    sessions = [create_session(seed, 1, side, input_delay) for side in ("left", "right")]
+    peers = []
+    for i, session in enumerate(sessions):
+        transport, peer = await loop.create_datagram_endpoint(
+            lambda session=session, i=i: NetplayPeer(session, latency=latency, jitter=jitter,
+                                                     loss=loss, seed=seed + i),
+            local_addr=("127.0.0.1", 0))
+        peers.append(peer)
+    peers[0].remote_addr = peers[1].transport.get_extra_info("sockname")
+    peers[1].remote_addr = peers[0].transport.get_extra_info("sockname")
+
+    await asyncio.gather(*(peer.run(random_walk_input(seed + 10 + i), ticks, tick_time=tick_time)
+                           for i, peer in enumerate(peers)))
+    # A peer that finished the series early stops at a smaller tick
+    end = min(session.tick for session in sessions)
+    for session in sessions:
+        if session.tick > end:
+            session.engine.restore(session.snapshots[end])
+    in_sync = sessions[0].engine.snapshot() == sessions[1].engine.snapshot()
+    for peer in peers:
+        peer.transport.close()
+    return [peer.stats() for peer in peers], in_sync
+
+
+async def play_online(role, address, port, best_of, input_delay, latency, jitter, loss):
+    import pygame
+
+    loop = asyncio.get_running_loop()
+    if role == "host":
+        seed = int.from_bytes(os.urandom(8), "little")
+        start_info = (seed, [3, 5, 7].index(best_of), input_delay)
+        transport, peer = await loop.create_datagram_endpoint(
+            lambda: NetplayPeer(latency=latency, jitter=jitter, loss=loss), local_addr=("0.0.0.0", port))
+        peer.start_info = start_info
+        print(f"Waiting for a player on port {port}...")
+        await peer.started.wait()
+        local_side = "left"
+    else:
+        transport, peer = await loop.create_datagram_endpoint(
+            lambda: NetplayPeer(remote_addr=address, latency=latency, jitter=jitter, loss=loss),
+            local_addr=("0.0.0.0", 0))
+        print(f"Connecting to {address[0]}:{address[1]}...")
+        while not peer.started.is_set():
+            peer.send(HELLO_PACKET.pack(HELLO))
+            try:
+                await asyncio.wait_for(peer.started.wait(), 0.2)
+            except asyncio.TimeoutError:
+                pass
+        local_side = "right"
+
+    seed, selected_match, input_delay = peer.start_info
+    peer.session = create_session(seed, selected_match, local_side, input_delay, headless=False)
+    peer.remote_ack = input_delay - 1
+
+    screen = pygame.display.get_surface()
+    engine = peer.session.engine
+
+    def read_keys(session):
+        keys = pygame.key.get_pressed()
+        return keys[pygame.K_s] - keys[pygame.K_w]
+
+    def render(session):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return False
+        screen.fill((0, 0, 0))
+        engine.render(screen)
+        pygame.display.flip()
+        if engine.audio:
+            engine.audio.drain()
+        return True
+
+    await peer.run(read_keys, on_tick=render)
+    transport.close()
+    return peer.stats()
+
+
+def print_stats(label, stats):
+    print(f"{label}: rtt {stats['rtt_ms_mean']:.1f} ms, "
+          f"{stats['rollbacks']} rollbacks ({stats['rollbacks_per_100_ticks']:.1f}/100 ticks, "
+          f"mean depth {stats['mean_rollback_depth']:.1f}, max {stats['max_rollback_depth']}), "
+          f"re-simulation {stats['resimulation_ms_per_rollback']:.3f} ms/rollback, "
+          f"{stats['stalls']} stalls, {stats['packets_dropped']}/{stats['packets_sent']} packets dropped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Two-player online Ping Pong with rollback netcode")
+    sub = parser.add_subparsers(dest="command", required=True)
+    host = sub.add_parser("host", help="wait for another player")
+    host.add_argument("--port", type=int, default=DEFAULT_PORT)
+    host.add_argument("--best-of", type=int, choices=[3, 5, 7], default=5)
+    join = sub.add_parser("join", help="join a hosted game")
+    join.add_argument("address", help="HOST or HOST:PORT")
+    selftest = sub.add_parser("selftest", help="two headless peers over localhost")
+    selftest.add_argument("--ticks", type=int, default=600)
+    for command in (host, join, selftest):
+        command.add_argument("--input-delay", type=int, default=2, help="ticks of local input delay")
+        command.add_argument("--latency", type=float, default=0.0, help="simulated one-way latency (s)")
+        command.add_argument("--jitter", type=float, default=0.0, help="simulated extra random latency (s)")
+        command.add_argument("--loss", type=float, default=0.0, help="simulated packet loss (0-1)")
+    args = parser.parse_args()
+
+    if args.command == "selftest":
+        stats, in_sync = asyncio.run(run_local_match(args.ticks, args.latency, args.jitter,
+                                                     args.loss, args.input_delay))
+        print_stats("left ", stats[0])
+        print_stats("right", stats[1])
+        print("Peers in sync" if in_sync else "DESYNC: peers ended in different states")
+        raise SystemExit(0 if in_sync else 1)
+
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    pygame.display.set_caption("Ping Pong - Online")
+    if args.command == "host":
+        stats = asyncio.run(play_online("host", None, args.port, args.best_of, args.input_delay,
+                                        args.latency, args.jitter, args.loss))
+    else:
+        host_name, _, port = args.address.partition(":")
+        stats = asyncio.run(play_online("join", (host_name, int(port or DEFAULT_PORT)), 0, 5,
+                                        args.input_delay, args.latency, args.jitter, args.loss))
+    pygame.quit()
+    print_stats("session", stats)
+
+
+if __name__ == "__main__":
+    main()
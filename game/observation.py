@@ -0,0 +1,140 @@
+import numpy as np
+from .game_engine import GameEngine
+
+# Pixel observations for learning agents
+#
+# An engine created with render_mode="rgb_array" draws into a bytearray that
+# backs its frame surface, so frame_view() is a NumPy view of the pixels the
+# engine just drew: nothing is copied out of pygame. Downsampling and
+# grayscale conversion run on that view and write straight into a
+# preallocated ring buffer (RGB frames as one 32-bit RGBX word per pixel).
+# Each frame is stored twice, stack frames apart, so the latest stack of
+# frames is always one contiguous slice and stacking never copies either.
+
+GRAY_WEIGHTS = (77, 150, 29)  # ITU-R BT.601 luma in 1/256ths; they sum to 256
+
+
+def frame_words(engine):
+    """The engine's last rendered frame as a (height, width) uint32 RGBX view"""
+    return np.frombuffer(engine.frame_buffer, dtype=np.uint32).reshape(engine.height, engine.width)
+
+
+def frame_view(engine):
+    """The engine's last rendered frame as a (height, width, 3) uint8 view"""
+    pixels = np.frombuffer(engine.frame_buffer, dtype=np.uint8)
+    return pixels.reshape(engine.height, engine.width, 4)[:, :, :3]
+
+
+class PixelObserver:
+    def __init__(self, engine, grayscale=False, downsample=1, stack=1, frame_skip=1):
+        if engine.render_mode != "rgb_array":
+            raise ValueError('PixelObserver needs an engine created with render_mode="rgb_array"')
+        self.engine = engine
+        self.grayscale = grayscale
+        self.downsample = downsample  # Keep every downsample-th pixel on both axes
+        self.stack = stack
+        self.frame_skip = frame_skip  # Ticks per observation
+
+        height = -(-engine.height // downsample)
+        width = -(-engine.width // downsample)
+        self.frame_shape = (height, width) if grayscale else (height, width, 3)
+        # RGB frames are kept as RGBX words so that storing one is a plain copy
+        dtype = np.uint8 if grayscale else np.uint32
+        self.frames = np.zeros((2 * stack, height, width), dtype=dtype)
+        self.index = 0  # Slot of the next frame (and its twin at index + stack)
+        if grayscale:
+            self.luma = np.zeros((height, width), dtype=np.uint16)
+            self.scratch = np.zeros((height, width), dtype=np.uint16)
+
+    @property
+    def shape(self):
+        """Shape of each observation: (stack, height, width[, 3])"""
+        return (self.stack,) + self.frame_shape
+
+    def capture(self):
+        """Render the engine, push the frame into the stack and return the observation"""
+        self.engine.render_frame()
+        step = self.downsample
+        slot = self.frames[self.index]
+        if self.grayscale:
+            self._to_gray(frame_view(self.engine)[::step, ::step], slot)
+        else:
+            np.copyto(slot, frame_words(self.engine)[::step, ::step])
+        self.frames[self.index + self.stack] = slot
+        self.index = (self.index + 1) % self.stack
+        return self.observation()
+
+    def _to_gray(self, pixels, out):
+        luma, scratch = self.luma, self.scratch
+        np.multiply(pixels[..., 0], GRAY_WEIGHTS[0], out=luma, dtype=np.uint16)
+        np.multiply(pixels[..., 1], GRAY_WEIGHTS[1], out=scratch, dtype=np.uint16)
+        luma += scratch
+        np.multiply(pixels[..., 2], GRAY_WEIGHTS[2], out=scratch, dtype=np.uint16)
+        luma += scratch
+        np.right_shift(luma, 8, out=out, casting="unsafe")
+
+    def observation(self):
+        """The last stack frames, oldest first, as a view into the ring buffer
+
+        The view is overwritten by later captures; copy it to keep it.
+        """
+        frames = self.frames[self.index:self.index + self.stack]
+        if self.grayscale:
+            return frames
+        return frames.view(np.uint8).reshape(frames.shape + (4,))[..., :3]
+
+    def reset(self):
+        """Fill the whole stack with the current frame"""
+        self.capture()
+        self.frames[:] = self.frames[(self.index - 1) % self.stack]
+        return self.observation()
+
+    def step(self, direction=0):
+        """Run frame_skip ticks with the left paddle moving in direction, then capture"""
+        engine = self.engine
+        engine.player_direction = direction
+        for _ in range(self.frame_skip):
+            engine.step()
+        return self.capture()
+
+
+def measure(observations=2000, **options):
+    """Observations per second for a match between two AI paddles"""
+    import time
+    from .ai import make_controller
+
+    engine = GameEngine(800, 600, render_mode="rgb_array", seed=0)
+    engine.player_controller = make_controller("medium", engine.rng)
+    engine.start_game()
+    observer = PixelObserver(engine, **options)
+    observer.reset()
+    start = time.perf_counter()
+    for _ in range(observations):
+        observer.step()
+        if engine.game_state != "playing":
+            engine.start_game()
+    return observations / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    import time
+    import pygame
+
+    configurations = [
+        ("rgb", {}),
+        ("rgb, stack 4", {"stack": 4}),
+        ("gray", {"grayscale": True}),
+        ("gray, 1/4 size, stack 4", {"grayscale": True, "downsample": 4, "stack": 4}),
+        ("gray, 1/4 size, stack 4, skip 4", {"grayscale": True, "downsample": 4, "stack": 4,
+                                              "frame_skip": 4}),
+    ]
+    # For comparison: the same frames copied out with pygame.image.tobytes
+    engine = GameEngine(800, 600, render_mode="rgb_array", seed=0)
+    engine.start_game()
+    start = time.perf_counter()
+    for _ in range(500):
+        engine.step()
+        pixels = np.frombuffer(pygame.image.tobytes(engine.render_frame(), "RGB"), dtype=np.uint8)
+    print(f"{'rgb via tobytes':<34}{500 / (time.perf_counter() - start):8.0f} observations/s")
+    for label, options in configurations:
+        print(f"{label:<34}{measure(**options):8.0f} observations/s")
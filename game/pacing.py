@@ -0,0 +1,160 @@
+import argparse
+import math
+import time
+from array import array
+import pygame
+from .profiler import percentile
+
+# Frame pacing
+#
+# Strategies for waiting out the rest of each frame:
+#   sleep   Clock.tick: sleeps, so the frame ends up to a timer tick late
+#   busy    Clock.tick_busy_loop: spins on the CPU for exact timing
+#   hybrid  sleeps until SPIN_MARGIN before the deadline, then spins
+#   vsync   doesn't wait; the flip blocks on the display's refresh
+# Each frame's interval goes into a ring buffer, and stats() compares the
+# jitter with the CPU time the process has used over the whole session.
+
+STRATEGIES = ("sleep", "busy", "hybrid", "vsync")
+SPIN_MARGIN = 0.002  # Seconds of spinning after the hybrid sleep; covers timer slack
+
+
+class FramePacer:
+    def __init__(self, fps=60, strategy="sleep", capacity=600):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown pacing strategy {strategy!r}")
+        self.fps = fps
+        self.strategy = strategy
+        self.frame_period = 1.0 / fps
+        self.clock = pygame.time.Clock()
+        self.capacity = capacity
+        self.intervals = array("d", bytes(8 * capacity))
+        self.index = 0
+        self.count = 0
+        self.reset()
+        # CPU use is measured over the whole session, waits on input included
+        self.cpu_start = time.process_time()
+        self.wall_start = self.last_frame
+
+    def reset(self):
+        """Restart frame timing, e.g. after blocking on input; the gap isn't a frame interval"""
+        self.clock.tick()
+        self.last_frame = self.deadline = time.perf_counter()
+        self.skip_next = True
+
+    def wait(self):
+        """Wait for the end of the frame; returns the frame time in seconds"""
+        if self.strategy == "sleep":
+            self.clock.tick(self.fps)
+        elif self.strategy == "busy":
+            self.clock.tick_busy_loop(self.fps)
+        elif self.strategy == "hybrid":
+            self._sleep_then_spin()
+
+        now = time.perf_counter()
+        interval = now - self.last_frame
+        self.last_frame = now
+        if self.skip_next:
+            self.skip_next = False
+        else:
+            self.intervals[self.index] = interval
+            self.index = (self.index + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+        return interval
+
+    def _sleep_then_spin(self):
+        # Deadlines advance by exactly one period so timing errors don't accumulate
+        self.deadline += self.frame_period
+        now = time.perf_counter()
+        if now > self.deadline:
+            self.deadline = now  # Running late: start the next period from here
+            return
+        if self.deadline - now > SPIN_MARGIN:
+            time.sleep(self.deadline - now - SPIN_MARGIN)
+        while time.perf_counter() < self.deadline:
+            pass
+
+    def _ordered(self):
+        if self.count < self.capacity:
+            return list(self.intervals[:self.count])
+        return list(self.intervals[self.index:]) + list(self.intervals[:self.index])
+
+    def stats(self):
+        """Frame interval and jitter in milliseconds, and CPU use since the pacer was created"""
+        intervals = self._ordered()
+        wall = time.perf_counter() - self.wall_start
+        result = {
+            "strategy": self.strategy,
+            "frames": len(intervals),
+            "cpu_percent": (time.process_time() - self.cpu_start) / wall * 100 if wall else 0.0,
+        }
+        if not intervals:
+            return result
+        mean = sum(intervals) / len(intervals)
+        deviations = sorted(abs(interval - self.frame_period) for interval in intervals)
+        result.update({
+            "mean_interval_ms": mean * 1000,
+            "stdev_ms": math.sqrt(sum((interval - mean) ** 2 for interval in intervals) / len(intervals)) * 1000,
+            "jitter_p50_ms": percentile(deviations, 0.50) * 1000,
+            "jitter_p95_ms": percentile(deviations, 0.95) * 1000,
+            "jitter_p99_ms": percentile(deviations, 0.99) * 1000,
+            "max_interval_ms": max(intervals) * 1000,
+            "late_frames": sum(interval > self.frame_period * 1.5 for interval in intervals),
+        })
+        return result
+
+    def report(self):
+        stats = self.stats()
+        if not stats["frames"]:
+            return f"{stats['strategy']}: no frames timed"
+        return (f"{stats['strategy']:<7} interval {stats['mean_interval_ms']:6.2f} ms "
+                f"(stdev {stats['stdev_ms']:.2f}), jitter p50 {stats['jitter_p50_ms']:.2f} "
+                f"p95 {stats['jitter_p95_ms']:.2f} p99 {stats['jitter_p99_ms']:.2f} ms, "
+                f"{stats['late_frames']} late, CPU {stats['cpu_percent']:.0f}%")
+
+
+def set_mode(size, strategy):
+    """Open the window; vsync needs a SCALED display and falls back to sleep without one"""
+    if strategy == "vsync":
+        try:
+            return pygame.display.set_mode(size, pygame.SCALED, vsync=1), strategy
+        except pygame.error as e:
+            print(f"vsync unavailable ({e}), pacing with sleep")
+            strategy = "sleep"
+    return pygame.display.set_mode(size), strategy
+
+
+def compare(seconds, fps, strategies):
+    """Run a moving-square animation under each strategy and print its stats"""
+    pygame.display.init()
+    for strategy in strategies:
+        screen, used = set_mode((320, 240), strategy)
+        pacer = FramePacer(fps, used, capacity=int(seconds * fps) + 1)
+        end = time.perf_counter() + seconds
+        x = 0
+        while time.perf_counter() < end:
+            pygame.event.pump()
+            screen.fill((0, 0, 0))
+            pygame.draw.rect(screen, (255, 255, 255), (x % 320, 110, 20, 20))
+            pygame.display.flip()
+            x += 4
+            pacer.wait()
+        print(pacer.report())
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare frame pacing strategies")
+    parser.add_argument("--seconds", type=float, default=5.0, help="time per strategy")
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("strategies", nargs="*", metavar="STRATEGY",
+                        help=f"strategies to compare: {', '.join(STRATEGIES)} (default: all)")
+    args = parser.parse_args()
+    for strategy in args.strategies:
+        if strategy not in STRATEGIES:
+            parser.error(f"unknown strategy {strategy!r}")
+    compare(args.seconds, args.fps, args.strategies or STRATEGIES)
+
+
+if __name__ == "__main__":
+    main()
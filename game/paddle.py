@@ -1,6 +1,8 @@
 import pygame
 
 class Paddle:
+    __slots__ = ("x", "y", "width", "height", "speed")
+
     def __init__(self, x, y, width, height):
         self.x = x
         self.y = y
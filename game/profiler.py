@@ -0,0 +1,148 @@
+import csv
+import json
+import time
+from array import array
+
+# Per-frame phase profiler
+#
+# Times each phase of the main loop into fixed-size ring buffers so there is
+# no allocation per frame. NullProfiler has the same interface and does
+# nothing, so the main loop can call it unconditionally.
+
+PHASES = ("input", "update", "render", "flip", "sleep")
+OVERLAY_REFRESH = 30  # Frames between overlay text updates
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    enabled = True
+
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self.frame_times = array("d", bytes(8 * capacity))
+        self.phase_times = {phase: array("d", bytes(8 * capacity)) for phase in PHASES}
+        self.index = 0  # Next slot to write
+        self.count = 0  # Number of valid samples
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.show_overlay = True
+        self.overlay_surfaces = []
+        self.frames_since_refresh = OVERLAY_REFRESH
+
+    def begin_frame(self):
+        self.frame_start = self.last_mark = time.perf_counter()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to phase"""
+        now = time.perf_counter()
+        self.phase_times[phase][self.index] = now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self):
+        self.frame_times[self.index] = self.last_mark - self.frame_start
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _ordered(self, values):
+        """Valid samples from a ring buffer, oldest first"""
+        if self.count < self.capacity:
+            return list(values[:self.count])
+        return list(values[self.index:]) + list(values[:self.index])
+
+    def summary(self):
+        """FPS, frame time percentiles and mean time per phase, in milliseconds"""
+        frames = sorted(self._ordered(self.frame_times))
+        total = sum(frames)
+        result = {
+            "frames": self.count,
+            "fps": self.count / total if total else 0.0,
+            "p50_ms": percentile(frames, 0.50) * 1000,
+            "p95_ms": percentile(frames, 0.95) * 1000,
+            "p99_ms": percentile(frames, 0.99) * 1000,
+            "phases_ms": {},
+        }
+        for phase in PHASES:
+            samples = self._ordered(self.phase_times[phase])
+            result["phases_ms"][phase] = sum(samples) / len(samples) * 1000 if samples else 0.0
+        return result
+
+    def draw_overlay(self, screen, font):
+        """Draw the stats in the top-left corner (text refreshed twice a second)"""
+        if not self.show_overlay:
+            return
+        self.frames_since_refresh += 1
+        if self.frames_since_refresh >= OVERLAY_REFRESH:
+            self.frames_since_refresh = 0
+            stats = self.summary()
+            lines = [
+                f"FPS {stats['fps']:.0f}",
+                f"p50 {stats['p50_ms']:.2f}  p95 {stats['p95_ms']:.2f}  p99 {stats['p99_ms']:.2f} ms",
+            ]
+            lines += [f"{phase} {ms:.2f} ms" for phase, ms in stats["phases_ms"].items()]
+            self.overlay_surfaces = [font.render(line, True, (255, 255, 0)) for line in lines]
+        for i, surface in enumerate(self.overlay_surfaces):
+            screen.blit(surface, (8, 8 + i * 18))
+
+    def dump(self, path):
+        """Write every sample to path, as JSON if it ends in .json, else CSV"""
+        columns = {"frame_ms": self._ordered(self.frame_times)}
+        for phase in PHASES:
+            columns[f"{phase}_ms"] = self._ordered(self.phase_times[phase])
+        columns = {name: [value * 1000 for value in values] for name, values in columns.items()}
+
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"summary": self.summary(), "samples": columns}, f, indent=2)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + list(columns))
+                for i, row in enumerate(zip(*columns.values())):
+                    writer.writerow([i] + [f"{value:.4f}" for value in row])
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off"""
+    enabled = False
+    show_overlay = False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def draw_overlay(self, screen, font):
+        pass
+
+
+class StartupProfile:
+    """Time from process start to the first frame, broken into named phases"""
+
+    def __init__(self, start=None):
+        self.start = self.last_mark = start if start is not None else time.perf_counter()
+        self.phases = []  # (name, seconds)
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last_mark))
+        self.last_mark = now
+
+    def report(self, first_frame_phase="first frame"):
+        lines = []
+        total = 0.0
+        for name, seconds in self.phases:
+            total += seconds
+            lines.append(f"{name:<20}{seconds * 1000:8.1f} ms  (at {total * 1000:7.1f} ms)")
+            if name == first_frame_phase:
+                lines.append(f"{'time to first frame':<20}{total * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,101 @@
+import pygame
+
+# Render-on-change scheduler
+#
+# The menu, game over and series over screens only change when the game state
+# or the selected match does, so in those states the main loop blocks in
+# pygame.event.wait and redraws nothing until one of them changes. While
+# playing, only the regions drawn this frame or the last one (paddles, ball
+# and score text) are cleared, redrawn and pushed to the display.
+
+BLACK = (0, 0, 0)
+STATIC_STATES = ("menu", "game_over", "series_over")
+IDLE_TIMEOUT_MS = 500  # Upper bound on one blocking wait
+REDRAW_EVENTS = {pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED,
+                 pygame.WINDOWSIZECHANGED}
+
+
+class RenderScheduler:
+    def __init__(self, engine, screen, enabled=True):
+        self.engine = engine
+        self.screen = screen
+        self.enabled = enabled  # False: clear, redraw and flip every frame
+        self.view = None  # (game_state, selected_match) last drawn
+        self.needs_redraw = True
+        self.dirty = []  # Rects drawn last frame, erased on the next one
+        self.pending = None  # What display() pushes: "full", a list of rects or None
+        self.waited = False  # The last get_events call blocked
+        self.overlay = False  # An overlay was drawn last frame; keep redrawing
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.skipped_frames = 0
+
+    def invalidate(self):
+        """Redraw the whole screen on the next frame"""
+        self.needs_redraw = True
+
+    def is_idle(self):
+        engine = self.engine
+        return (self.enabled and not self.needs_redraw and not self.overlay
+                and engine.game_state in STATIC_STATES
+                and self.view == (engine.game_state, engine.selected_match))
+
+    def get_events(self, timeout_ms=IDLE_TIMEOUT_MS):
+        """This frame's events; on an unchanged static screen, block until one arrives"""
+        self.waited = self.is_idle()
+        if self.waited:
+            event = pygame.event.wait(timeout_ms)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events += pygame.event.get()
+        else:
+            events = pygame.event.get()
+        if any(event.type in REDRAW_EVENTS for event in events):
+            self.invalidate()
+        return events
+
+    def draw(self, overlay=None):
+        """Draw what changed since the last frame; display() then pushes it
+
+        overlay(screen) draws on top of the frame; it forces a full redraw
+        since it is not tracked. Returns "full", "partial" or None if nothing
+        was drawn.
+        """
+        engine = self.engine
+        view = (engine.game_state, engine.selected_match)
+        self.overlay = overlay is not None
+        full = not self.enabled or self.needs_redraw or self.overlay or view != self.view
+        if not full and engine.game_state in STATIC_STATES:
+            self.pending = None
+            self.skipped_frames += 1
+            return None
+        self.view = view
+        self.needs_redraw = False
+
+        if full:
+            self.screen.fill(BLACK)
+            if engine.game_state == "playing":
+                self.dirty = engine.render_playing(self.screen)
+            else:
+                engine.render(self.screen)
+                self.dirty = []
+            if overlay is not None:
+                overlay(self.screen)
+            self.pending = "full"
+            self.full_frames += 1
+            return "full"
+
+        for rect in self.dirty:
+            self.screen.fill(BLACK, rect)
+        drawn = engine.render_playing(self.screen)
+        self.pending = self.dirty + drawn
+        self.dirty = drawn
+        self.partial_frames += 1
+        return "partial"
+
+    def display(self):
+        """Flip after a full redraw, update only the changed rects after a partial one"""
+        if self.pending == "full":
+            pygame.display.flip()
+        elif self.pending:
+            pygame.display.update(self.pending)
+        self.pending = None
@@ -0,0 +1,206 @@
+import argparse
+import bisect
+import os
+import struct
+import time
+from array import array
+from .ai import make_controller
+from .input import INPUT_STEPS
+
+# Match replays
+#
+# Gameplay is deterministic given the engine's RNG seed and the player's
+# paddle direction on every tick, so a replay stores only those: a header
+# with the seed and match options, the per-tick direction packed four bits
+# per tick, and engine snapshots every KEYFRAME_INTERVAL ticks so playback
+# can seek quickly. Directions are multiples of 1/INPUT_STEPS (see input.py).
+#
+# File layout (little-endian): HEADER, then keyframe_count keyframes (tick,
+# length, snapshot bytes), then the packed input (2 ticks per byte).
+
+MAGIC = b"PPRP"
+VERSION = 4  # 2: compact struct snapshots and SmallRandom, 3: rally counters, 4: fractional input
+HEADER = struct.Struct("<4sHHHHQB15sIII")
+KEYFRAME_HEADER = struct.Struct("<II")
+KEYFRAME_INTERVAL = 600  # Ten seconds at 60 ticks per second
+FLAG_SWEPT = 1
+
+
+class ReplayRecorder:
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.clear()
+        self.seed = 0
+        self.width = self.height = 0
+        self.selected_match = 0
+        self.controller_name = "medium"
+        self.flags = 0
+
+    def attach(self, engine):
+        """Record every series started on engine from now on"""
+        engine.recorder = self
+        return self
+
+    def clear(self):
+        self.ticks = 0
+        self.inputs = array("B")
+        self.keyframes = []
+
+    def start(self, engine):
+        """Called by GameEngine.start_game: reseed the engine and start a new recording"""
+        self.clear()
+        self.seed = int.from_bytes(os.urandom(8), "little")
+        engine.rng.seed(self.seed)
+        self.width = engine.width
+        self.height = engine.height
+        self.selected_match = engine.selected_match
+        self.controller_name = engine.ai_controller.name
+        self.flags = FLAG_SWEPT if engine.swept_collision else 0
+
+    def record_tick(self, engine):
+        """Called by GameEngine.step before each playing tick"""
+        if self.ticks % self.keyframe_interval == 0:
+            self.keyframes.append((self.ticks, engine.snapshot()))
+        steps = round(engine.player_direction * INPUT_STEPS) + INPUT_STEPS  # 0 .. 2 * INPUT_STEPS
+        if self.ticks & 1 == 0:
+            self.inputs.append(steps)
+        else:
+            self.inputs[-1] |= steps << 4
+        self.ticks += 1
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.flags, self.width, self.height, self.seed,
+                                self.selected_match, self.controller_name.encode(), self.ticks,
+                                self.keyframe_interval, len(self.keyframes)))
+            for tick, data in self.keyframes:
+                f.write(KEYFRAME_HEADER.pack(tick, len(data)))
+                f.write(data)
+            self.inputs.tofile(f)
+
+
+class ReplayPlayer:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        (magic, version, self.flags, self.width, self.height, self.seed, self.selected_match,
+         controller, self.ticks, self.keyframe_interval, keyframe_count) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        self.controller_name = controller.rstrip(b"\0").decode()
+
+        offset = HEADER.size
+        self.keyframes = []
+        for _ in range(keyframe_count):
+            tick, length = KEYFRAME_HEADER.unpack_from(data, offset)
+            offset += KEYFRAME_HEADER.size
+            self.keyframes.append((tick, data[offset:offset + length]))
+            offset += length
+        self.keyframe_ticks = [tick for tick, _ in self.keyframes]
+        self.inputs = array("B", data[offset:])
+        self.tick = 0  # Next tick to play on the engine last passed to seek()
+
+    def create_engine(self, headless=True):
+        """A GameEngine set up like the recorded one, positioned at tick 0"""
+        from .game_engine import GameEngine
+
+        engine = GameEngine(self.width, self.height, headless=headless,
+                            swept_collision=bool(self.flags & FLAG_SWEPT), seed=self.seed)
+        engine.ai_controller = make_controller(self.controller_name, engine.rng)
+        self.seek(engine, 0)
+        return engine
+
+    def direction(self, tick):
+        steps = (self.inputs[tick >> 1] >> ((tick & 1) * 4)) & 0xF
+        return (steps - INPUT_STEPS) / INPUT_STEPS
+
+    def seek(self, engine, tick):
+        """Jump to tick: restore the nearest earlier keyframe and simulate forward"""
+        tick = max(0, min(tick, self.ticks))
+        index = bisect.bisect_right(self.keyframe_ticks, tick) - 1
+        self.tick, data = self.keyframes[index]
+        engine.restore(data)
+        self.run(engine, tick)
+
+    def step(self, engine):
+        """Play one recorded tick"""
+        # The player continued the series from the game over screen here
+        if engine.game_state == "game_over" and engine.series_winner is None:
+            engine.start_next_game()
+        engine.player_direction = self.direction(self.tick)
+        engine.step()
+        self.tick += 1
+
+    def run(self, engine, until=None):
+        """Play as fast as possible up to tick until (the end by default)"""
+        until = self.ticks if until is None else min(until, self.ticks)
+        while self.tick < until:
+            self.step(engine)
+
+    @property
+    def finished(self):
+        return self.tick >= self.ticks
+
+
+def play_on_screen(replay, seek=0, speed=1.0):
+    """Show the replay in a window at speed times real time (ESC quits)"""
+    import pygame
+    from .game_engine import TICK_TIME, MAX_FRAME_TIME
+
+    pygame.init()
+    screen = pygame.display.set_mode((replay.width, replay.height))
+    pygame.display.set_caption("Ping Pong - Replay")
+    clock = pygame.time.Clock()
+    engine = replay.create_engine(headless=False)
+    replay.seek(engine, seek)
+
+    running = True
+    accumulator = 0.0
+    frame_time = 0.0
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+
+        accumulator += min(frame_time, MAX_FRAME_TIME) * speed
+        while accumulator >= TICK_TIME and not replay.finished:
+            replay.step(engine)
+            accumulator -= TICK_TIME
+        engine.render_alpha = 1.0 if replay.finished else accumulator / TICK_TIME
+        if engine.audio:
+            engine.audio.drain()
+
+        screen.fill((0, 0, 0))
+        engine.render(screen)
+        pygame.display.flip()
+        frame_time = clock.tick(60) / 1000.0
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a recorded match")
+    parser.add_argument("path")
+    parser.add_argument("--headless", action="store_true", help="simulate without a window and report speed")
+    parser.add_argument("--seek", type=int, default=0, metavar="TICK", help="start playback at this tick")
+    parser.add_argument("--speed", type=float, default=1.0, help="on-screen playback speed multiplier")
+    args = parser.parse_args()
+
+    replay = ReplayPlayer(args.path)
+    if not args.headless:
+        play_on_screen(replay, args.seek, args.speed)
+        return
+
+    engine = replay.create_engine()
+    start = time.perf_counter()
+    replay.seek(engine, args.seek)
+    replay.run(engine)
+    elapsed = time.perf_counter() - start
+    ticks = replay.ticks - args.seek
+    print(f"Replayed {ticks} ticks in {elapsed * 1000:.1f} ms "
+          f"({ticks / 60 / elapsed:.0f}x real time)")
+    print(f"Final: game {engine.player_score}-{engine.ai_score}, "
+          f"series {engine.player_series_wins}-{engine.ai_series_wins}, state {engine.game_state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import os
+
+# Small deterministic RNG
+#
+# xorshift64* with a single 64-bit word of state, so engine snapshots can
+# store it in 8 bytes (random.Random's state is about 2.5 KB). Provides the
+# subset of the random.Random interface the game uses.
+
+MASK64 = (1 << 64) - 1
+
+
+class SmallRandom:
+    __slots__ = ("state",)
+
+    def __init__(self, seed=None):
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        # splitmix64 spreads nearby seeds over the whole state space
+        z = (seed + 0x9E3779B97F4A7C15) & MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+        self.state = (z ^ (z >> 31)) or 1  # xorshift must never hold zero
+
+    def next64(self):
+        x = self.state
+        x ^= x >> 12
+        x ^= (x << 25) & MASK64
+        x ^= x >> 27
+        self.state = x
+        return (x * 0x2545F4914F6CDD1D) & MASK64
+
+    def random(self):
+        """Float in [0, 1)"""
+        return (self.next64() >> 11) * (1.0 / (1 << 53))
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def choice(self, seq):
+        return seq[self.next64() % len(seq)]
+
+    def getstate(self):
+        return self.state
+
+    def setstate(self, state):
+        self.state = state
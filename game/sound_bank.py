@@ -0,0 +1,156 @@
+import hashlib
+import os
+import threading
+import time
+import numpy as np
+import pygame
+from .cache import cache_dir as default_cache_dir
+
+# Sound bank
+#
+# Sound effects are synthesized with NumPy the first time they are needed (or
+# on a background thread via preload) and the int16 PCM is kept in a versioned
+# on-disk cache of .npy files. Later launches memory-map the cached files
+# instead of synthesizing them again. Effects with "pitches" get one variant
+# per pitch factor, so hits can sound higher as the ball speeds up.
+
+SAMPLE_RATE = 22050
+CACHE_VERSION = 1
+
+# Each effect is a sum of sine waves with an exponential decay envelope
+EFFECTS = {
+    "paddle": {"duration": 0.15, "frequencies": (800,), "amplitude": 0.5, "decay": 8, "volume": 0.7,
+               "pitches": (1.0, 1.12, 1.25, 1.4)},
+    "wall": {"duration": 0.15, "frequencies": (300,), "amplitude": 0.4, "decay": 8, "volume": 0.5,
+             "pitches": (1.0, 1.12, 1.25, 1.4)},
+    "score": {"duration": 0.5, "frequencies": (440, 554), "amplitude": 0.3, "decay": 3, "volume": 0.8},
+    "click": {"duration": 0.08, "frequencies": (1200,), "amplitude": 0.3, "decay": 15, "volume": 0.6},
+}
+
+
+def synthesize(params, sample_rate=SAMPLE_RATE, pitch=1.0):
+    """Build the stereo int16 PCM for one effect, with its frequencies scaled by pitch"""
+    duration = params["duration"]
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    wave = sum(np.sin(frequency * pitch * 2 * np.pi * t) for frequency in params["frequencies"])
+    wave = wave * params["amplitude"] * np.exp(-t * params["decay"])
+    stereo = np.column_stack((wave, wave))
+    return np.ascontiguousarray((stereo * 32767).astype(np.int16))
+
+
+class SoundBank:
+    def __init__(self, cache_dir=None, effects=EFFECTS, sample_rate=SAMPLE_RATE):
+        self.cache_dir = cache_dir if cache_dir is not None else default_cache_dir()
+        self.effects = effects
+        self.sample_rate = sample_rate
+        self.pcm = {}  # (name, variant) -> int16 array (memory-mapped when loaded from cache)
+        self.sounds = {}  # (name, variant) -> pygame.mixer.Sound
+        self.lock = threading.Lock()
+        self.thread = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def variants(self, name):
+        """Number of pitch variants of an effect"""
+        return len(self.effects[name].get("pitches", (1.0,)))
+
+    def cache_path(self, name, variant=0):
+        """Versioned cache file; changing an effect's parameters changes the name"""
+        pitch = self.effects[name].get("pitches", (1.0,))[variant]
+        key = repr((CACHE_VERSION, self.sample_rate, sorted(self.effects[name].items()), pitch))
+        digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{name}-{variant}-v{CACHE_VERSION}-{digest}.npy")
+
+    def load_pcm(self, name, variant=0):
+        """PCM for an effect: from memory, the disk cache, or fresh synthesis"""
+        with self.lock:
+            pcm = self.pcm.get((name, variant))
+            if pcm is not None:
+                return pcm
+
+            path = self.cache_path(name, variant)
+            try:
+                pcm = np.load(path, mmap_mode="r")
+                self.cache_hits += 1
+            except (OSError, ValueError):
+                pitch = self.effects[name].get("pitches", (1.0,))[variant]
+                pcm = synthesize(self.effects[name], self.sample_rate, pitch)
+                self.cache_misses += 1
+                self._save(path, pcm)
+            self.pcm[(name, variant)] = pcm
+            return pcm
+
+    def _save(self, path, pcm):
+        # Write to a temporary file first so a crash never leaves a torn cache entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, pcm)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write sound cache {path}: {e}")
+
+    def get(self, name, variant=0):
+        """The pygame Sound for an effect, created on first use (None if unknown)"""
+        sound = self.sounds.get((name, variant))
+        if sound is None:
+            if name not in self.effects:
+                return None
+            sound = pygame.sndarray.make_sound(self.load_pcm(name, variant))
+            sound.set_volume(self.effects[name]["volume"])
+            self.sounds[(name, variant)] = sound
+        return sound
+
+    def ready(self, name, variant=0):
+        """The Sound if it has been prepared already, else None; never blocks"""
+        return self.sounds.get((name, variant))
+
+    def preload(self):
+        """Prepare every variant of every effect on a background thread
+
+        PCM is always prepared; Sound objects too once the mixer is running.
+        """
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._preload_all, name="sound-bank", daemon=True)
+            self.thread.start()
+        return self.thread
+
+    def _preload_all(self):
+        for name in self.effects:
+            for variant in range(self.variants(name)):
+                try:
+                    if pygame.mixer.get_init():
+                        self.get(name, variant)
+                    else:
+                        self.load_pcm(name, variant)
+                except Exception as e:
+                    print(f"Could not prepare sound {name}: {e}")
+
+
+def measure_startup(cache_dir):
+    """Time preparing every sound with a cold and a warm cache, in milliseconds"""
+    import shutil
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    timings = {}
+    for label in ("cold", "warm"):
+        start = time.perf_counter()
+        bank = SoundBank(cache_dir)
+        for name in bank.effects:
+            for variant in range(bank.variants(name)):
+                bank.get(name, variant)
+        timings[label] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.pre_init(frequency=SAMPLE_RATE, size=-16, channels=2, buffer=512)
+    pygame.mixer.init()
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = measure_startup(os.path.join(tmp, "sounds"))
+    print(f"Sound bank startup without cache: {timings['cold']:.1f} ms")
+    print(f"Sound bank startup with cache:    {timings['warm']:.1f} ms")
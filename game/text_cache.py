@@ -0,0 +1,63 @@
+import pygame
+from collections import OrderedDict
+
+# Text and overlay surface cache
+#
+# Rendering text rasterizes glyphs and allocates a new Surface on every call.
+# Most strings on screen change a few times per game at most, so surfaces are
+# kept in a bounded LRU cache keyed on everything that affects the pixels.
+
+
+class TextCache:
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """Cached equivalent of font.render(text, antialias, color)"""
+        key = (font, text, antialias, color)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self._store(key, surface)
+        return surface
+
+    def overlay(self, size, alpha, color=(0, 0, 0)):
+        """Cached solid surface of the given size, color and alpha"""
+        key = ("overlay", size, alpha, color)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = pygame.Surface(size)
+            surface.set_alpha(alpha)
+            surface.fill(color)
+            self._store(key, surface)
+        return surface
+
+    def _lookup(self, key):
+        surface = self.entries.get(key)
+        if surface is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return surface
+
+    def _store(self, key, surface):
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # Evict least recently used
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self.entries),
+        }
@@ -0,0 +1,218 @@
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import importlib
+import json
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .ai import make_controller
+from .game_engine import GameEngine
+
+# Headless tournament runner
+#
+# Plays best-of-N series between two paddle controllers across a process
+# pool. Series are grouped into chunks so each task does enough work to hide
+# the inter-process overhead; every series gets its own seed derived from the
+# tournament seed and its index, so results don't depend on how chunks are
+# scheduled. Results stream back as chunks finish.
+#
+# The two seats aren't equivalent (without swept collision the left paddle
+# can barely return a serve), so controllers swap seats on odd seeds. A
+# controller playing itself then wins about half of its series; playing
+# from one seat, tracking vs tracking and medium vs medium went 0 of 20.
+
+MAX_TICKS_PER_SERIES = 200000  # Give up on endless rallies between perfect players
+Z_95 = 1.959964
+
+
+def load_controller(spec, rng):
+    """Controller from a name (see ai.make_controller) or "module:Class\""""
+    if ":" in spec:
+        module_name, class_name = spec.split(":", 1)
+        return getattr(importlib.import_module(module_name), class_name)()
+    return make_controller(spec, rng)
+
+
+def play_series(left, right, best_of, seed, swept_collision=False):
+    """Play one series headless; returns a result dict (winner None on timeout)
+
+    "left" and "right" name the two controllers, not seats: on odd seeds
+    left plays from the right-hand seat.
+    """
+    swapped = seed % 2 == 1
+    engine = GameEngine(800, 600, headless=True, swept_collision=swept_collision, seed=seed)
+    left_controller = load_controller(left, engine.rng)
+    right_controller = load_controller(right, engine.rng)
+    if swapped:
+        left_controller, right_controller = right_controller, left_controller
+    engine.player_controller = left_controller
+    engine.ai_controller = right_controller
+    engine.selected_match = engine.match_options.index(best_of)
+    engine.start_game()
+
+    rallies = []
+    points = 0
+    ticks = 0
+    while ticks < MAX_TICKS_PER_SERIES:
+        engine.step()
+        ticks += 1
+        if engine.player_score + engine.ai_score != points:
+            rallies.append(engine.last_rally_hits)
+        points = engine.player_score + engine.ai_score
+        if engine.game_state == "game_over":
+            if engine.series_winner is not None:
+                break
+            engine.start_next_game()
+            points = 0
+
+    seats = {"Player": "left", "AI": "right"} if not swapped else {"Player": "right", "AI": "left"}
+    left_games, right_games = engine.player_series_wins, engine.ai_series_wins
+    if swapped:
+        left_games, right_games = right_games, left_games
+    return {
+        "winner": seats.get(engine.series_winner),
+        "left_games": left_games,
+        "right_games": right_games,
+        "rallies": rallies,
+        "ticks": ticks,
+    }
+
+
+def play_chunk(left, right, best_of, seeds, swept_collision):
+    return [play_series(left, right, best_of, seed, swept_collision) for seed in seeds]
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    """Confidence interval for a win rate (Wilson score interval)"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return centre - margin, centre + margin
+
+
+class TournamentStats:
+    def __init__(self):
+        self.series = 0
+        self.left_wins = 0
+        self.right_wins = 0
+        self.timeouts = 0
+        self.left_games = 0
+        self.right_games = 0
+        self.ticks = 0
+        self.rally_count = 0
+        self.rally_sum = 0
+        self.rally_sum_squares = 0
+        self.longest_rally = 0
+
+    def add(self, result):
+        self.series += 1
+        if result["winner"] == "left":
+            self.left_wins += 1
+        elif result["winner"] == "right":
+            self.right_wins += 1
+        else:
+            self.timeouts += 1
+        self.left_games += result["left_games"]
+        self.right_games += result["right_games"]
+        self.ticks += result["ticks"]
+        for rally in result["rallies"]:
+            self.rally_count += 1
+            self.rally_sum += rally
+            self.rally_sum_squares += rally * rally
+            self.longest_rally = max(self.longest_rally, rally)
+
+    def summary(self):
+        decided = self.left_wins + self.right_wins
+        low, high = wilson_interval(self.left_wins, decided)
+        mean = self.rally_sum / self.rally_count if self.rally_count else 0.0
+        variance = (self.rally_sum_squares / self.rally_count - mean * mean) if self.rally_count else 0.0
+        margin = Z_95 * math.sqrt(max(variance, 0.0) / self.rally_count) if self.rally_count else 0.0
+        return {
+            "series": self.series,
+            "left_wins": self.left_wins,
+            "right_wins": self.right_wins,
+            "timeouts": self.timeouts,
+            "left_win_rate": self.left_wins / decided if decided else 0.0,
+            "left_win_rate_ci95": [low, high],
+            "left_games": self.left_games,
+            "right_games": self.right_games,
+            "points": self.rally_count,
+            "mean_rally_hits": mean,
+            "mean_rally_hits_ci95": [mean - margin, mean + margin],
+            "longest_rally_hits": self.longest_rally,
+            "ticks": self.ticks,
+        }
+
+
+def run_tournament(left, right, series, best_of=5, jobs=None, seed=0, chunk_size=10,
+                   swept_collision=False, on_progress=None):
+    """Play series on a process pool; on_progress(stats) runs after each chunk"""
+    stats = TournamentStats()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = []
+        for start in range(0, series, chunk_size):
+            seeds = [seed * 1000003 + index for index in range(start, min(start + chunk_size, series))]
+            futures.append(pool.submit(play_chunk, left, right, best_of, seeds, swept_collision))
+        for future in as_completed(futures):
+            for result in future.result():
+                stats.add(result)
+            if on_progress:
+                on_progress(stats)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless best-of-N tournament between paddle controllers")
+    parser.add_argument("left", help='left paddle controller: "tracking", "easy", "medium", "hard", '
+                                     '"perfect" or "module:Class"')
+    parser.add_argument("right", help="right paddle controller")
+    parser.add_argument("--series", type=int, default=1000, help="number of series to play")
+    parser.add_argument("--best-of", type=int, choices=[3, 5, 7], default=5)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=10, help="series per task")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--swept", action="store_true", help="use swept collision detection")
+    parser.add_argument("--json", metavar="PATH", help="write the summary as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def progress(stats):
+        print(f"\r{stats.series}/{args.series} series, left {stats.left_wins} - "
+              f"{stats.right_wins} right", end="", file=sys.stderr, flush=True)
+
+    stats = run_tournament(args.left, args.right, args.series, args.best_of, args.jobs, args.seed,
+                           args.chunk_size, args.swept, progress)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    summary = stats.summary()
+    summary.update({
+        "left": args.left,
+        "right": args.right,
+        "best_of": args.best_of,
+        "jobs": args.jobs,
+        "elapsed_s": elapsed,
+        "series_per_s": summary["series"] / elapsed,
+    })
+    low, high = summary["left_win_rate_ci95"]
+    print(f"{args.left} vs {args.right}, best of {args.best_of}: {summary['series']} series in "
+          f"{elapsed:.1f} s ({summary['series_per_s']:.1f}/s on {args.jobs} workers)")
+    print(f"  {args.left} win rate {summary['left_win_rate']:.3f} (95% CI {low:.3f}-{high:.3f}), "
+          f"{summary['timeouts']} timeouts")
+    print(f"  rally length {summary['mean_rally_hits']:.2f} hits/point over {summary['points']} points, "
+          f"longest {summary['longest_rally_hits']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
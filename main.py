@@ -1,44 +1,141 @@
+import time
+
+STARTUP_START = time.perf_counter()
+
+import argparse
 import pygame
 from game.game_engine import GameEngine
-
-# Initialize pygame/Start application
-pygame.init()
+from game.input import PaddleInput
+from game.pacing import STRATEGIES, FramePacer, set_mode
+from game.profiler import FrameProfiler, NullProfiler, StartupProfile
+from game.render_scheduler import RenderScheduler
+from game.replay import ReplayRecorder
 
 # Screen dimensions
 WIDTH, HEIGHT = 800, 600
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Ping Pong - Pygame Version")
 
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
-# Clock
-clock = pygame.time.Clock()
+# Render rate only; the simulation runs at a fixed tick rate
 FPS = 60
 
-# Game loop
-engine = GameEngine(WIDTH, HEIGHT)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ping Pong")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each frame phase and show a performance overlay (F3 toggles it)")
+    parser.add_argument("--profile-dump", metavar="PATH",
+                        help="with --profile, write frame samples to PATH on exit (.json or .csv)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the last series played to PATH (play it with python -m game.replay)")
+    parser.add_argument("--frame-input", action="store_true",
+                        help="sample W/S once per frame and move whole ticks (no late latching)")
+    parser.add_argument("--pacing", choices=STRATEGIES, default="sleep",
+                        help="how to wait for the next frame (default: sleep, like Clock.tick)")
+    parser.add_argument("--pacing-report", action="store_true",
+                        help="print frame interval jitter and CPU use on exit")
+    parser.add_argument("--history", nargs="?", const="", metavar="PATH",
+                        help="store every point, game and series in a SQLite database "
+                             "(see python -m game.history)")
+    parser.add_argument("--chaos", type=int, metavar="N",
+                        help="stress mode: add N extra balls that bounce off the paddles and each other")
+    parser.add_argument("--full-redraw", action="store_true",
+                        help="redraw and flip the whole screen every frame, even on static screens")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print how long each startup phase takes to reach the first frame, then exit")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    startup = StartupProfile(STARTUP_START)
+    startup.mark("imports")
+
+    # Only the subsystems needed to draw; audio starts after the first frame
+    pygame.display.init()
+    pygame.font.init()
+    startup.mark("pygame init")
+    screen, pacing = set_mode((WIDTH, HEIGHT), args.pacing)
+    pygame.display.set_caption("Ping Pong - Pygame Version")
+    pacer = FramePacer(FPS, pacing)
+    startup.mark("window")
+    engine = GameEngine(WIDTH, HEIGHT, defer_audio=True)
+    engine.player_input = PaddleInput(late_latch=not args.frame_input)
+    startup.mark("engine + fonts")
+
+    profiler = FrameProfiler() if args.profile else NullProfiler()
+    recorder = ReplayRecorder().attach(engine) if args.record else None
+    history = None
+    if args.history is not None:
+        from game.history import MatchHistory
+        history = MatchHistory(args.history or None).attach(engine)
+    if args.chaos:
+        from game.multiball import MultiBall
+        MultiBall(args.chaos, WIDTH, HEIGHT).attach(engine)
+    scheduler = RenderScheduler(engine, screen, enabled=not args.full_redraw)
+
     running = True
+    first_frame = True
+    frame_time = 0.0
     while running:
-        SCREEN.fill(BLACK)
-        events = pygame.event.get()
+        profiler.begin_frame()
+        # Blocks on static screens until there is input to handle
+        events = scheduler.get_events()
+        if scheduler.waited:
+            pacer.reset()  # Time spent waiting is not simulation time
         for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.show_overlay = not profiler.show_overlay
+                scheduler.invalidate()
 
         # Handle input and check for quit signal
         result = engine.handle_input(events)
         if result == "quit":
             running = False
-            
-        engine.update()
-        engine.render(SCREEN)
+        profiler.mark("input")
+
+        # Late latch: pick up key presses that arrived while handling this frame's events
+        if engine.game_state == "playing" and engine.player_input.late_latch:
+            engine.player_input.latch()
+        engine.update(frame_time)
+        if engine.audio:
+            engine.audio.drain()
+        profiler.mark("update")
+
+        overlay = None
+        if profiler.show_overlay:
+            overlay = lambda surface: profiler.draw_overlay(surface, engine.small_font)
+        scheduler.draw(overlay)
+        profiler.mark("render")
+
+        scheduler.display()
+        profiler.mark("flip")
+
+        if first_frame:
+            first_frame = False
+            startup.mark("first frame")
+            engine.init_audio()
+            startup.mark("audio")
+            if args.startup_profile:
+                print(startup.report())
+                running = False
+
+        frame_time = pacer.wait()
+        profiler.mark("sleep")
+        profiler.end_frame()
 
-        pygame.display.flip()
-        clock.tick(FPS)
+    if args.pacing_report:
+        print(pacer.report())
+    if profiler.enabled and args.profile_dump:
+        profiler.dump(args.profile_dump)
+        print(f"Profile written to {args.profile_dump}")
+    if history and history.close() is not None:
+        print(f"Match history is incomplete: {history.error}")
+    if recorder and recorder.ticks:
+        recorder.save(args.record)
+        print(f"Replay written to {args.record}")
 
     pygame.quit()
 